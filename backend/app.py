@@ -5,24 +5,100 @@ Main application entry point that initializes Flask and registers routes.
 """
 
 import os
-from flask import Flask
+import hashlib
+import threading
+import orjson
+from cachetools import TTLCache
+from flask import Flask, Response, g, request
+from flask.json.provider import DefaultJSONProvider, JSONProvider
 from flask_cors import CORS
 
+from config import RESPONSE_CACHE_SIZE, RESPONSE_CACHE_TTL
 from data_loader import load_all_data
+from kernels import warm_up_kernels
 from routes import api
 
+
+class ORJSONProvider(JSONProvider):
+    """JSON provider backed by orjson, which serializes numpy scalars and arrays natively.
+
+    NaN values are written as null. Objects orjson does not handle itself
+    (including datetimes, to keep Flask's HTTP date format) go through
+    Flask's default conversion.
+    """
+
+    options = (
+        orjson.OPT_SERIALIZE_NUMPY
+        | orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_SORT_KEYS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+    )
+
+    def dumps_bytes(self, obj):
+        """Serialize obj straight to UTF-8 JSON bytes."""
+        return orjson.dumps(obj, default=DefaultJSONProvider.default, option=self.options)
+
+    def dumps(self, obj, **kwargs):
+        return self.dumps_bytes(obj).decode()
+
+    def response(self, *args, **kwargs):
+        # Hand orjson's bytes to the response as-is instead of decoding and re-encoding them
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.dumps_bytes(obj), mimetype='application/json')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
 # Initialize Flask app
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
 CORS(app)  # Enable CORS for React frontend
 
 # Register API blueprint
 app.register_blueprint(api, url_prefix='/api')
 
+# Response cache for the API: (body, status, mimetype) keyed on path + query string
+_response_cache = TTLCache(maxsize=RESPONSE_CACHE_SIZE, ttl=RESPONSE_CACHE_TTL)
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache_key():
+    """Build the cache key from the request path and its sorted query arguments."""
+    args = sorted(request.args.lists())
+    return hashlib.blake2b(f"{request.path}?{args}".encode()).hexdigest()
+
+
+@app.before_request
+def serve_cached_response():
+    """Return the cached response for repeated GET requests to the API."""
+    if request.method != 'GET' or not request.path.startswith('/api/'):
+        return None
+    g.response_cache_key = get_response_cache_key()
+    with _response_cache_lock:
+        cached = _response_cache.get(g.response_cache_key)
+    if cached is None:
+        return None
+    g.response_cache_hit = True
+    body, status, mimetype = cached
+    return Response(body, status=status, mimetype=mimetype)
+
+
+@app.after_request
+def store_cached_response(response):
+    """Cache successful API responses that were not served from the cache."""
+    key = g.get('response_cache_key')
+    if key is not None and not g.get('response_cache_hit') and response.status_code == 200:
+        with _response_cache_lock:
+            _response_cache[key] = (response.get_data(), response.status_code, response.mimetype)
+    return response
+
 
 if __name__ == '__main__':
     # Preload data on startup
     print("Loading data...")
     load_all_data()
+    warm_up_kernels()
     print("Starting Flask server...")
     # Only enable debug mode if explicitly set via environment variable
     debug_mode = os.environ.get('FLASK_DEBUG', 'false').lower() == 'true'
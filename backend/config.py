@@ -14,3 +14,20 @@ TOUR_B_COLOR = '#4ECDC4'
 # Data processing
 # Maximum expected power for these buildings (kW). Values above this are treated as outliers.
 MAX_POWER_CAP = 50  # kW cap for outlier removal
+
+# Bump when the layout of the cached combined dataset changes
+DATA_CACHE_VERSION = 2
+
+# Cell values treated as missing when parsing the concentrator CSV exports
+CSV_NULL_VALUES = ['', 'NA', 'N/A', 'NaN', 'nan', 'null', '---']
+
+# Bytes of CSV parsed per block when streaming the concentrator exports
+CSV_BLOCK_SIZE = 64 << 20  # 64 MiB
+
+# API response cache
+# Responses are memoized per path and query string; the data only changes on restart.
+RESPONSE_CACHE_SIZE = 512  # Maximum number of cached responses
+RESPONSE_CACHE_TTL = 300  # Seconds before a cached response expires
+
+# Threads used to compute the Tour A and Tour B halves of a response side by side
+COMPUTE_WORKERS = 4
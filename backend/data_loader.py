@@ -4,142 +4,499 @@ Data loading and processing utilities for power consumption data
 
 import os
 import re
+import csv
+import hashlib
+import threading
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import pandas as pd
 import numpy as np
-from config import MAX_POWER_CAP
+import pyarrow as pa
+import pyarrow.csv as pacsv
+from config import MAX_POWER_CAP, CSV_NULL_VALUES, CSV_BLOCK_SIZE, DATA_CACHE_VERSION
 
 
 # ============================================================================
 # DATA LOADING UTILITIES
 # ============================================================================
 
-def normalize_column_name(col_name):
-    """Normalize column names by removing trailing numeric suffixes."""
-    normalized = re.sub(r'\s*\d+$', '', str(col_name).strip())
-    if not normalized.endswith(' ') and normalized not in ['Date', 'Time']:
-        normalized = normalized + ' '
-    return normalized
+# Main power column of each tour: "<prefix> ... kW sys ... avg", excluding kvar columns
+_POWER_COLUMN_PATTERNS = {
+    'A': re.compile(r'^(?!.*kvar)(?=.*kw sys)(?=.*avg).*tour_a_\(tgbt_d14\)', re.IGNORECASE),
+    'B': re.compile(r'^(?!.*kvar)(?=.*kw sys)(?=.*avg).*tour_b_\(tgbt_d5\)', re.IGNORECASE),
+}
+
+
+# Trailing numeric suffix added to repeated headers in the XLSX exports
+_NUMERIC_SUFFIX_RE = re.compile(r'\s*\d+$')
+_UNSUFFIXED_COLUMNS = frozenset(('Date', 'Time'))
+
+
+def normalize_column_names(columns):
+    """Normalize column names by removing trailing numeric suffixes.
+
+    Works on the whole column Index with pandas string methods; every name
+    except Date/Time ends up with exactly one trailing space.
+    """
+    names = pd.Index(columns).astype(str).str.strip().str.replace(_NUMERIC_SUFFIX_RE, '', regex=True)
+    needs_space = ~names.isin(_UNSUFFIXED_COLUMNS) & ~names.str.endswith(' ')
+    return names.where(~needs_space, names + ' ')
+
+
+def iter_data_files(data_dir):
+    """Recursively yield the CSV and XLSX files below data_dir."""
+    with os.scandir(data_dir) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from iter_data_files(entry.path)
+            elif entry.name.endswith(('.csv', '.xlsx')) and entry.is_file():
+                yield entry.path
 
 
 def get_data_files(data_dir):
     """Find all CSV and XLSX files in the data directory."""
-    data_files = []
-    for root, dirs, files in os.walk(data_dir):
-        for file in files:
-            if file.endswith('.csv') or file.endswith('.xlsx'):
-                data_files.append(os.path.join(root, file))
-    return sorted(data_files)
+    if not os.path.isdir(data_dir):
+        return []
+    return sorted(iter_data_files(data_dir))
+
+
+def is_wanted_column(col):
+    """Check whether a column is Date/Time or one of the power columns served by the API."""
+    return col in ('Date', 'Time') or any(p.search(str(col)) for p in _POWER_COLUMN_PATTERNS.values())
+
+
+def read_csv_header(file_path):
+    """Read the column names from the header line of a semicolon-separated CSV file."""
+    with open(file_path, newline='', encoding='utf-8-sig') as f:
+        return next(csv.reader(f, delimiter=';'), [])
+
+
+def read_csv_file(file_path):
+    """Read the Date/Time and power columns of a semicolon-separated CSV file.
+
+    The file is streamed block by block with the PyArrow reader and only the
+    wanted columns are converted, so peak memory stays around CSV_BLOCK_SIZE
+    whatever the size of the export. Falls back to the pandas parser when
+    PyArrow cannot convert a column (e.g. a power column that switches to
+    text halfway through the file); the same columns are read there and
+    left to pd.to_numeric to coerce.
+    """
+    columns = [col for col in read_csv_header(file_path) if is_wanted_column(col)]
+    column_types = {col: pa.string() if col in ('Date', 'Time') else pa.float32() for col in columns}
+    try:
+        reader = pacsv.open_csv(
+            file_path,
+            read_options=pacsv.ReadOptions(use_threads=True, block_size=CSV_BLOCK_SIZE),
+            parse_options=pacsv.ParseOptions(delimiter=';'),
+            convert_options=pacsv.ConvertOptions(
+                include_columns=columns,
+                column_types=column_types,
+                null_values=CSV_NULL_VALUES,
+                strings_can_be_null=True
+            )
+        )
+        table = pa.Table.from_batches(list(reader), schema=reader.schema)
+    except pa.ArrowInvalid:
+        return pd.read_csv(
+            file_path,
+            sep=';',
+            usecols=columns,
+            dtype={'Date': str, 'Time': str},
+            na_values=CSV_NULL_VALUES
+        )
+    return table.to_pandas(split_blocks=True, self_destruct=True)
+
+
+def build_datetime_index(dates, times):
+    """Build the Datetime index from the Date (dd-mm-YYYY) and Time (HH:MM:SS) columns.
+
+    Instead of concatenating both columns into strings and parsing every row,
+    dates and times are parsed separately and added as datetime64/timedelta64
+    arrays. Times repeat every day, so each distinct value is parsed only once.
+    Dates that are already datetime64 (XLSX files) are only truncated to the day.
+    """
+    if pd.api.types.is_datetime64_any_dtype(dates):
+        days = dates.to_numpy().astype('datetime64[D]').astype('datetime64[ns]')
+    else:
+        days = pd.to_datetime(dates, format='%d-%m-%Y', errors='coerce', cache=True).to_numpy()
+    codes, unique_times = pd.factorize(times)
+    offsets = pd.to_timedelta(unique_times.astype(str), errors='coerce').to_numpy()
+    # Missing times get code -1, which picks up the trailing NaT
+    offsets = np.append(offsets, np.timedelta64('NaT', 'ns'))
+    return pd.DatetimeIndex(days + offsets[codes], name='Datetime')
+
+
+def select_power_columns(df):
+    """Keep only the Date/Time columns and the power columns served by the API."""
+    return df[[col for col in df.columns if is_wanted_column(col)]]
 
 
 def load_single_file(file_path):
     """Load a single CSV/XLSX file with proper parsing."""
     try:
         if file_path.endswith('.csv'):
-            df = pd.read_csv(file_path, sep=';', low_memory=False)
+            df = read_csv_file(file_path)
         elif file_path.endswith('.xlsx'):
-            df = pd.read_excel(file_path)
+            df = pd.read_excel(file_path, engine='calamine', na_values=CSV_NULL_VALUES)
             if 'Date' in df.columns:
-                df['Date'] = pd.to_datetime(df['Date']).dt.strftime('%d-%m-%Y')
-            df.columns = [normalize_column_name(col) for col in df.columns]
+                df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
+            df.columns = normalize_column_names(df.columns)
         else:
             return None
 
+        df = select_power_columns(df)
         if 'Date' in df.columns and 'Time' in df.columns:
-            mask = ~(df['Time'] == '24:00:00')
-            df = df[mask]
-            df['Datetime'] = pd.to_datetime(
-                df['Date'] + ' ' + df['Time'],
-                format='%d-%m-%Y %H:%M:%S',
-                errors='coerce'
-            )
-            df.set_index('Datetime', inplace=True)
-            df.drop(['Date', 'Time'], axis=1, inplace=True)
-        return df
+            # 24:00:00 rollover rows are rare, so only copy the frame when there are some
+            rollover_rows = np.flatnonzero(df['Time'].to_numpy() == '24:00:00')
+            if rollover_rows.size:
+                df = df.drop(df.index[rollover_rows])
+            df.index = build_datetime_index(df['Date'], df['Time'])
+            df = df.drop(['Date', 'Time'], axis=1)
+        return df.apply(pd.to_numeric, errors='coerce', downcast='float')
     except Exception as e:
         print(f"Error loading {file_path}: {e}")
         return None
 
 
+@lru_cache(maxsize=32)
+def find_power_column(columns, tour):
+    """Find the main power column for a tour in a tuple of column names."""
+    pattern = _POWER_COLUMN_PATTERNS['A' if tour.upper() == 'A' else 'B']
+    return next((col for col in columns if pattern.search(col)), None)
+
+
 def get_power_column(df, tour):
     """Get the main power consumption column for a tour."""
-    if tour.upper() == 'A':
-        prefixes = ['TOUR_A_(TGBT_D14)']
-    else:
-        prefixes = ['Tour_B_(TGBT_D5)']
-
-    for col in df.columns:
-        col_lower = col.lower()
-        for prefix in prefixes:
-            if prefix.lower() in col_lower and 'kw sys' in col_lower and 'avg' in col_lower and 'kvar' not in col_lower:
-                return col
-    return None
+    return find_power_column(tuple(df.columns), tour)
 
 
 def clean_power_data(series):
-    """Clean power data by removing outliers."""
-    power = pd.to_numeric(series, errors='coerce')
-    mean_power = power.mean()
-    std_power = power.std()
+    """Clean power data by removing outliers.
+
+    Mean and standard deviation come from a single sum / sum-of-squares pass
+    over a float32 copy of the data, and outliers are masked in place.
+    """
+    values = pd.to_numeric(series, errors='coerce').to_numpy(dtype=np.float32, copy=True)
+    count = np.count_nonzero(~np.isnan(values))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        total = np.nansum(values, dtype=np.float64)
+        total_sq = np.nansum(np.square(values, dtype=np.float64))
+        mean_power = total / count
+        std_power = np.sqrt((total_sq - count * mean_power ** 2) / (count - 1))
     upper_limit = min(mean_power + 3 * std_power, MAX_POWER_CAP)
-    power = power.where(power <= upper_limit, np.nan)
-    return power
+    values[~(values <= upper_limit)] = np.nan
+    return pd.Series(values, index=series.index, name=series.name)
+
+
+def get_files_manifest(data_files):
+    """Fingerprint the data files by path, modification time and size."""
+    entries = sorted((path, os.path.getmtime(path), os.path.getsize(path)) for path in data_files)
+    return hashlib.sha1(repr((DATA_CACHE_VERSION, entries)).encode()).hexdigest()
+
+
+def get_temp_path(path):
+    """Temporary file next to path, unique to this process, to write before os.replace."""
+    return f'{path}.{os.getpid()}.tmp'
+
+
+def read_arrow_cache(cache_file):
+    """Read a cached DataFrame from an Arrow IPC file through a memory map.
+
+    The file is uncompressed, so its pages live in the OS page cache and are
+    shared by every worker process that maps it.
+    """
+    with pa.memory_map(cache_file) as source:
+        table = pa.ipc.open_file(source).read_all()
+    return table.to_pandas(split_blocks=True)
+
+
+def write_arrow_cache(df, cache_file):
+    """Write a DataFrame (including its index) to an Arrow IPC file.
+
+    The file is written under a temporary name and renamed over the old one,
+    so workers that have the old cache memory-mapped are not left reading a
+    truncated file.
+    """
+    table = pa.Table.from_pandas(df, preserve_index=True)
+    temp_file = get_temp_path(cache_file)
+    with pa.OSFile(temp_file, 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(temp_file, cache_file)
+
+
+def get_power_manifest(files_manifest):
+    """Fingerprint the cleaned power arrays by data files and cleaning settings."""
+    return hashlib.sha1(repr((files_manifest, MAX_POWER_CAP)).encode()).hexdigest()
+
 
+def read_power_arrays_cache(cache_folder, manifest):
+    """Memory-map the cached cleaned Tour A/B power arrays if they match the manifest.
 
-# Global data cache
-_data_cache = None
-_power_a_cache = None
-_power_b_cache = None
+    The arrays are opened read-only, so every worker process shares the same
+    page-cache pages instead of holding its own copy.
+    """
+    manifest_file = os.path.join(cache_folder, 'power.manifest')
+    array_files = [os.path.join(cache_folder, 'power_a.npy'), os.path.join(cache_folder, 'power_b.npy')]
+    if not all(os.path.exists(path) for path in [manifest_file] + array_files):
+        return None
+    with open(manifest_file) as f:
+        if f.read().strip() != manifest:
+            return None
+    return tuple(np.load(path, mmap_mode='r') for path in array_files)
+
+
+def write_power_arrays_cache(cache_folder, manifest, power_a, power_b):
+    """Save the cleaned Tour A/B power arrays as .npy files, writing the manifest last.
+
+    Each array is written to a temporary file and renamed over the old one,
+    so processes that still have the old file memory-mapped keep reading
+    their own copy instead of a file truncated under them.
+    """
+    os.makedirs(cache_folder, exist_ok=True)
+    for name, power in (('power_a.npy', power_a), ('power_b.npy', power_b)):
+        path = os.path.join(cache_folder, name)
+        temp_path = get_temp_path(path)
+        with open(temp_path, 'wb') as f:
+            np.save(f, as_power_array(power))
+        os.replace(temp_path, path)
+    with open(os.path.join(cache_folder, 'power.manifest'), 'w') as f:
+        f.write(manifest)
+
+
+def load_combined_data(data_files, cache_folder, manifest):
+    """Load and combine the data files, reusing the Arrow cache if they are unchanged."""
+    cache_file = os.path.join(cache_folder, 'combined.arrow')
+    manifest_file = os.path.join(cache_folder, 'combined.manifest')
+
+    if os.path.exists(cache_file) and os.path.exists(manifest_file):
+        with open(manifest_file) as f:
+            if f.read().strip() == manifest:
+                print("Loading cached combined data...")
+                return read_arrow_cache(cache_file)
+
+    # Parsing releases the GIL inside PyArrow/pandas, so threads scale with files
+    with ThreadPoolExecutor(max_workers=max(1, min(32, len(data_files)))) as executor:
+        all_data = [df for df in executor.map(load_single_file, data_files) if df is not None]
+
+    if not all_data:
+        return None
+
+    # Arrow concatenation only chains the per-file chunks; the frame is materialized once
+    tables = [pa.Table.from_pandas(df, preserve_index=True) for df in all_data]
+    del all_data
+    combined_table = pa.concat_tables(tables, promote_options='default')
+    del tables
+    combined_df = combined_table.to_pandas(split_blocks=True, self_destruct=True)
+    del combined_table
+    combined_df = combined_df[combined_df.index.notna()]
+    combined_df = combined_df.sort_index()
+
+    try:
+        os.makedirs(cache_folder, exist_ok=True)
+        write_arrow_cache(combined_df, cache_file)
+        with open(manifest_file, 'w') as f:
+            f.write(manifest)
+    except (OSError, ValueError, pa.ArrowException) as e:
+        print(f"Could not write data cache: {e}")
+
+    return combined_df
+
+
+def build_time_parts(index):
+    """Precompute compact time-part arrays and per-month row ranges for a sorted DatetimeIndex.
+
+    month_code numbers the months consecutively (year * 12 + month - 1);
+    month_slices maps each 'YYYY-MM' present in the index, in order, to the
+    (start, stop) positions of its rows; they are contiguous since the index
+    is sorted.
+    """
+    years = index.year.to_numpy(dtype=np.uint16)
+    months = index.month.to_numpy(dtype=np.uint8)
+    month_codes = years.astype(np.int32) * 12 + months - 1
+    codes, starts = np.unique(month_codes, return_index=True)
+    stops = np.append(starts[1:], len(month_codes))
+    month_slices = {
+        f'{code // 12:04d}-{code % 12 + 1:02d}': (int(start), int(stop))
+        for code, start, stop in zip(codes, starts, stops)
+    }
+    return {
+        'year': years,
+        'month': months,
+        'month_code': month_codes,
+        'dayofweek': index.dayofweek.to_numpy(dtype=np.uint8),
+        'hour': index.hour.to_numpy(dtype=np.uint8),
+        'month_slices': month_slices,
+    }
+
+
+def build_rollups(index, values_a, values_b):
+    """Hourly and daily per-bin sums and valid counts of both power arrays.
+
+    Coarser aggregations are built from these rollups instead of the raw
+    15-minute rows; keeping sums and counts (rather than means) lets them
+    be re-aggregated exactly.
+    """
+    columns = {}
+    for name, values in (('a', values_a), ('b', values_b)):
+        if values is None:
+            values = np.full(len(index), np.nan, dtype=np.float32)
+        valid = ~np.isnan(values)
+        columns[f'sum_{name}'] = np.where(valid, values, 0).astype(np.float64)
+        columns[f'count_{name}'] = valid.astype(np.int32)
+    hourly = pd.DataFrame(columns, index=index).resample('h').sum()
+    return {
+        'hourly': hourly,
+        'daily': hourly.resample('D').sum(),
+    }
+
+
+def build_month_patterns(month_code, dayofweek, hour, values_a, values_b):
+    """Per-month (tour, day of week, hour) sums and valid counts of both power arrays.
+
+    Returns {'YYYY-MM': (sums, counts)} with float64 sums and int64 counts
+    of shape (2, 7, 24), tour A first. Endpoints filtered by month only
+    read their hour / day-of-week averages from here instead of scanning
+    the rows.
+    """
+    codes, month_index = np.unique(month_code, return_inverse=True)
+    cells = (month_index * 7 + dayofweek) * 24 + hour
+    n_months = len(codes)
+    sums = np.zeros((n_months, 2, 7, 24))
+    counts = np.zeros((n_months, 2, 7, 24), dtype=np.int64)
+    for tour, values in enumerate((values_a, values_b)):
+        if values is None:
+            continue
+        valid = ~np.isnan(values)
+        valid_cells = cells[valid]
+        sums[:, tour] = np.bincount(valid_cells, weights=values[valid], minlength=n_months * 168).reshape(n_months, 7, 24)
+        counts[:, tour] = np.bincount(valid_cells, minlength=n_months * 168).reshape(n_months, 7, 24)
+    return {
+        f'{code // 12:04d}-{code % 12 + 1:02d}': (sums[i], counts[i])
+        for i, code in enumerate(codes)
+    }
+
+
+@dataclass(frozen=True)
+class DataBundle:
+    """The loaded dataset and everything derived from it, read-only once published."""
+
+    df: pd.DataFrame  # Column-less frame carrying the shared Datetime index
+    power_a: pd.Series  # Cleaned Tour A power (None if the column is missing)
+    power_b: pd.Series  # Cleaned Tour B power (None if the column is missing)
+    values_a: np.ndarray  # Contiguous float32 values of power_a
+    values_b: np.ndarray  # Contiguous float32 values of power_b
+    year: np.ndarray  # uint16 year of each row
+    month: np.ndarray  # uint8 month of each row
+    month_code: np.ndarray  # int32 year * 12 + month - 1 of each row
+    dayofweek: np.ndarray  # uint8 day of week of each row (Monday=0)
+    hour: np.ndarray  # uint8 hour of each row
+    month_slices: dict  # 'YYYY-MM' -> (start, stop) row range
+    month_patterns: dict  # 'YYYY-MM' -> (sums, counts) per (tour, day of week, hour)
+    hourly: pd.DataFrame  # Hourly sum_a/count_a/sum_b/count_b rollup
+    daily: pd.DataFrame  # Daily sum_a/count_a/sum_b/count_b rollup
+
+
+def as_power_array(power):
+    """Contiguous float32 values of a power series (None stays None)."""
+    if power is None:
+        return None
+    return np.ascontiguousarray(power.to_numpy(dtype=np.float32))
+
+
+def build_data_bundle(df, power_a, power_b):
+    """Bundle the combined data and cleaned power series with their derived arrays."""
+    values_a = as_power_array(power_a)
+    values_b = as_power_array(power_b)
+    time_parts = build_time_parts(df.index)
+    return DataBundle(
+        df=df,
+        power_a=power_a,
+        power_b=power_b,
+        values_a=values_a,
+        values_b=values_b,
+        month_patterns=build_month_patterns(
+            time_parts['month_code'], time_parts['dayofweek'], time_parts['hour'], values_a, values_b
+        ),
+        **time_parts,
+        **build_rollups(df.index, values_a, values_b)
+    )
+
+
+# Global data cache, filled once and read-only afterwards
+_data_bundle = None
+_data_loaded = threading.Event()
+_data_load_lock = threading.Lock()
+
+
+def get_data():
+    """Get the loaded DataBundle, loading it on first use (None if there is no data).
+
+    Concurrent cold calls are serialized by a lock so the data is only
+    ingested once; afterwards the loaded event makes this a plain lookup.
+    """
+    if not _data_loaded.is_set():
+        with _data_load_lock:
+            if not _data_loaded.is_set():
+                ingest_all_data()
+    return _data_bundle
 
 
 def load_all_data():
     """Load all data files and cache them."""
-    global _data_cache, _power_a_cache, _power_b_cache
+    data = get_data()
+    if data is None:
+        return None, None, None
+    return data.df, data.power_a, data.power_b
+
+
+def publish_data(df, power_a, power_b):
+    """Replace the global DataBundle and mark the data as loaded (caller holds the lock)."""
+    global _data_bundle
+    _data_bundle = build_data_bundle(df, power_a, power_b)
+    _data_loaded.set()
 
-    if _data_cache is not None:
-        return _data_cache, _power_a_cache, _power_b_cache
 
+def ingest_all_data():
+    """Read the data into the global cache (caller holds the lock)."""
     base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     cache_folder = os.path.join(base_dir, 'cache')
-    tour_a_file = os.path.join(cache_folder, 'tour_a_processed.csv')
-    tour_b_file = os.path.join(cache_folder, 'tour_b_processed.csv')
-    if os.path.exists(cache_folder) and os.path.exists(tour_a_file) and os.path.exists(tour_b_file):
-        print("Loading cached processed data...")
-        power_a = pd.read_csv(tour_a_file, index_col=0, parse_dates=True)
-        power_b = pd.read_csv(tour_b_file, index_col=0, parse_dates=True)
-        _power_a_cache = power_a['power']
-        _power_b_cache = power_b['power']
-        combined_df = pd.concat([_power_a_cache, _power_b_cache], axis=1)
-        combined_df.columns = ['Tour_A_Power', 'Tour_B_Power']
-        _data_cache = combined_df
-        return _data_cache, _power_a_cache, _power_b_cache
-    
     data_dir = os.path.join(base_dir, "SINERT_DATA_CONCENTRATOR")
 
     data_files = get_data_files(data_dir)
     print(f"Found {len(data_files)} data files")
 
-    all_data = []
-    for file_path in data_files:
-        df = load_single_file(file_path)
-        if df is not None:
-            all_data.append(df)
+    manifest = get_files_manifest(data_files)
+    combined_df = load_combined_data(data_files, cache_folder, manifest)
 
-    if all_data:
-        combined_df = pd.concat(all_data, ignore_index=False)
-        combined_df = combined_df[combined_df.index.notna()]
-        combined_df = combined_df.sort_index()
-        _data_cache = combined_df
+    # Without data the next call tries again, e.g. once files have been added
+    if combined_df is None:
+        return
 
-        # Get power columns
-        power_col_a = get_power_column(combined_df, 'A')
-        power_col_b = get_power_column(combined_df, 'B')
+    # Get power columns
+    power_col_a = get_power_column(combined_df, 'A')
+    power_col_b = get_power_column(combined_df, 'B')
+    power_a = None
+    power_b = None
 
+    power_manifest = get_power_manifest(manifest)
+    cached_power = read_power_arrays_cache(cache_folder, power_manifest) if power_col_a and power_col_b else None
+    if cached_power is not None and all(len(values) == len(combined_df) for values in cached_power):
+        print("Loading cached power arrays...")
+        power_a = pd.Series(cached_power[0], index=combined_df.index, name=power_col_a)
+        power_b = pd.Series(cached_power[1], index=combined_df.index, name=power_col_b)
+    else:
         if power_col_a:
-            _power_a_cache = clean_power_data(combined_df[power_col_a])
+            power_a = clean_power_data(combined_df[power_col_a])
         if power_col_b:
-            _power_b_cache = clean_power_data(combined_df[power_col_b])
-
-        print(f"Data loaded: {len(combined_df)} records")
-        return _data_cache, _power_a_cache, _power_b_cache
+            power_b = clean_power_data(combined_df[power_col_b])
+        if power_col_a and power_col_b:
+            try:
+                write_power_arrays_cache(cache_folder, power_manifest, power_a, power_b)
+            except (OSError, ValueError) as e:
+                print(f"Could not write power cache: {e}")
 
-    return None, None, None
+    # Only the cleaned power series are served, so the raw columns are not kept around
+    publish_data(combined_df[[]], power_a, power_b)
+    print(f"Data loaded: {len(combined_df)} records")
@@ -0,0 +1,27 @@
+"""
+Gunicorn configuration for the Power Consumption Dashboard API
+
+Run from the backend directory:
+    gunicorn -c gunicorn.conf.py app:app
+"""
+
+import multiprocessing
+import os
+
+from data_loader import load_all_data
+from kernels import warm_up_kernels
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count()))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+
+# Import the app in the master process so the data loaded below is shared
+# copy-on-write by all forked workers instead of being loaded once per worker
+preload_app = True
+
+
+def on_starting(server):
+    """Load the dataset and compile the kernels once in the master process, before workers fork."""
+    load_all_data()
+    warm_up_kernels()
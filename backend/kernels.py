@@ -0,0 +1,167 @@
+"""
+Numba-compiled kernels for the API aggregations
+"""
+
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True, nogil=True)
+def group_nanmean(values, codes, size):
+    """Mean of values per integer group code in [0, size) in a single pass, ignoring NaNs.
+
+    Groups without any valid value are NaN.
+    """
+    sums = np.zeros(size)
+    counts = np.zeros(size, dtype=np.int64)
+    for i in range(values.shape[0]):
+        value = values[i]
+        if value == value:
+            sums[codes[i]] += value
+            counts[codes[i]] += 1
+
+    means = np.full(size, np.nan)
+    for group in range(size):
+        if counts[group] > 0:
+            means[group] = sums[group] / counts[group]
+    return means
+
+
+@njit(cache=True, nogil=True)
+def power_moments(values):
+    """Count, mean, sample variance, skewness, excess kurtosis, min and max, ignoring NaNs.
+
+    The first loop gathers count/sum/min/max and the second the central
+    moment sums, so nothing is allocated and the higher moments do not
+    suffer from raw power-sum cancellation. Skewness and kurtosis use the
+    same bias-corrected estimators as pandas; undefined statistics are NaN.
+    """
+    count = 0
+    total = 0.0
+    min_val = np.inf
+    max_val = -np.inf
+    for i in range(values.shape[0]):
+        value = values[i]
+        if value == value:
+            count += 1
+            total += value
+            if value < min_val:
+                min_val = value
+            if value > max_val:
+                max_val = value
+
+    if count == 0:
+        return 0, np.nan, np.nan, np.nan, np.nan, np.nan, np.nan
+
+    mean = total / count
+    m2 = 0.0
+    m3 = 0.0
+    m4 = 0.0
+    for i in range(values.shape[0]):
+        value = values[i]
+        if value == value:
+            delta = value - mean
+            delta2 = delta * delta
+            m2 += delta2
+            m3 += delta2 * delta
+            m4 += delta2 * delta2
+
+    n = float(count)
+    variance = m2 / (n - 1) if count > 1 else np.nan
+
+    skewness = np.nan
+    if count > 2:
+        skewness = 0.0 if m2 == 0 else n * (n - 1) ** 0.5 / (n - 2) * (m3 / m2 ** 1.5)
+
+    kurtosis = np.nan
+    if count > 3:
+        if m2 == 0:
+            kurtosis = 0.0
+        else:
+            adjustment = 3 * (n - 1) ** 2 / ((n - 2) * (n - 3))
+            kurtosis = n * (n + 1) * (n - 1) * m4 / ((n - 2) * (n - 3) * m2 ** 2) - adjustment
+
+    return count, mean, variance, skewness, kurtosis, float(min_val), float(max_val)
+
+
+@njit(cache=True, nogil=True)
+def compare_pass(values_a, values_b, hour):
+    """Count the points where each tour is higher and average B - A per hour, in one pass.
+
+    Expects aligned, NaN-free arrays; hours without points get a NaN difference.
+    """
+    a_higher = 0
+    b_higher = 0
+    sums = np.zeros(24)
+    counts = np.zeros(24, dtype=np.int64)
+    for i in range(values_a.shape[0]):
+        a = values_a[i]
+        b = values_b[i]
+        if a > b:
+            a_higher += 1
+        elif b > a:
+            b_higher += 1
+        sums[hour[i]] += b - a
+        counts[hour[i]] += 1
+
+    hourly_diff = np.full(24, np.nan)
+    for h in range(24):
+        if counts[h] > 0:
+            hourly_diff[h] = sums[h] / counts[h]
+    return a_higher, b_higher, hourly_diff
+
+
+@njit(cache=True, nogil=True)
+def summary_pass(values, dayofweek):
+    """Totals for the summary metrics in one pass, ignoring NaNs.
+
+    Returns (count, sum, max, smallest positive value, weekday sum, weekday
+    count, weekend sum, weekend count); max and the smallest positive value
+    are 0 when there is no such value.
+    """
+    count = 0
+    total = 0.0
+    max_val = -np.inf
+    min_positive = np.inf
+    weekday_sum = 0.0
+    weekday_count = 0
+    weekend_sum = 0.0
+    weekend_count = 0
+    for i in range(values.shape[0]):
+        value = values[i]
+        if value != value:
+            continue
+        count += 1
+        total += value
+        if value > max_val:
+            max_val = value
+        if 0 < value < min_positive:
+            min_positive = value
+        if dayofweek[i] < 5:
+            weekday_sum += value
+            weekday_count += 1
+        else:
+            weekend_sum += value
+            weekend_count += 1
+
+    if count == 0:
+        max_val = 0.0
+    if min_positive == np.inf:
+        min_positive = 0.0
+    return (count, total, float(max_val), float(min_positive),
+            weekday_sum, weekday_count, weekend_sum, weekend_count)
+
+
+def warm_up_kernels():
+    """Compile the kernels for the cached data types so the first request does not pay for it."""
+    writable = np.zeros(1, dtype=np.float32)
+    read_only = np.zeros(1, dtype=np.float32)
+    read_only.setflags(write=False)
+    codes = np.zeros(1, dtype=np.uint8)
+    # Freshly ingested power values are writable, while values served from the
+    # memory-mapped .npy cache are read-only; numba compiles each separately
+    for values in (writable, read_only):
+        group_nanmean(values, codes, 24)
+        power_moments(values)
+        compare_pass(values, values, codes)
+        summary_pass(values, codes)
@@ -5,16 +5,151 @@ API route handlers for Power Consumption Dashboard
 import os
 import sys
 import pickle
-from flask import Blueprint, jsonify, request
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from flask import Blueprint, Response, current_app, jsonify, request
 import pandas as pd
 import numpy as np
 
-from config import INTERVAL_HOURS
-from data_loader import load_all_data, get_data_files, load_single_file, get_power_column, clean_power_data
+from config import INTERVAL_HOURS, COMPUTE_WORKERS
+from kernels import group_nanmean, power_moments, compare_pass, summary_pass
+from data_loader import (
+    get_data, get_data_files, load_single_file, get_power_column, clean_power_data
+)
 
 # Create Blueprint
 api = Blueprint('api', __name__)
 
+# Shared pool for computing the independent Tour A and Tour B halves of a response
+_compute_pool = ThreadPoolExecutor(max_workers=COMPUTE_WORKERS, thread_name_prefix='compute')
+
+
+# ============================================================================
+# FILTER HELPERS
+# ============================================================================
+
+@lru_cache(maxsize=1024)
+def parse_filter_date(value):
+    """Parse a start_date/end_date query value; dashboards repeat the same few."""
+    return pd.to_datetime(value)
+
+
+def build_filter_slice(data, month=None, start_date=None, end_date=None):
+    """Rows matching the month/date filters, as a slice of the sorted data index.
+
+    Each of these filters selects a contiguous run of rows, so the bounds
+    come from the month slices precomputed at load time and binary searches
+    on the sorted index instead of boolean masks.
+    """
+    lo, hi = 0, len(data.df)
+    if month:
+        lo, hi = data.month_slices.get(month, (0, 0))
+    if start_date:
+        lo = max(lo, int(data.df.index.searchsorted(parse_filter_date(start_date), side='left')))
+    if end_date:
+        hi = min(hi, int(data.df.index.searchsorted(parse_filter_date(end_date), side='right')))
+    return slice(lo, max(lo, hi))
+
+
+def month_pattern_totals(data, month=None):
+    """(tour, day of week, hour) sums and counts over the month filter, shape (2, 7, 24) each.
+
+    Taken from the per-month patterns precomputed at load time, so no rows
+    are scanned; an unknown month gives all-zero counts.
+    """
+    if month:
+        patterns = [data.month_patterns[month]] if month in data.month_patterns else []
+    else:
+        patterns = data.month_patterns.values()
+    sums = sum((pattern[0] for pattern in patterns), np.zeros((2, 7, 24)))
+    counts = sum((pattern[1] for pattern in patterns), np.zeros((2, 7, 24), dtype=np.int64))
+    return sums, counts
+
+
+def tour_stats(values, weekdays):
+    """Count, total, mean, extremes and weekday/weekend means of one tour's values.
+
+    All of them come from a single summary_pass over the values, shared by
+    /api/summary and /api/insights. min is the smallest positive value;
+    means without any valid value are NaN.
+    """
+    (count, total, max_val, min_val,
+     weekday_sum, weekday_count, weekend_sum, weekend_count) = summary_pass(values, weekdays)
+    return {
+        'count': count,
+        'total': total,
+        'avg': total / count if count > 0 else np.nan,
+        'max': max_val,
+        'min': min_val,
+        'weekday_avg': weekday_sum / weekday_count if weekday_count > 0 else np.nan,
+        'weekend_avg': weekend_sum / weekend_count if weekend_count > 0 else np.nan
+    }
+
+
+def cell_means(sums, counts):
+    """Divide sums by counts, leaving cells without data as NaN."""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return sums / counts
+
+
+def rollup_window(data, rollup, freq, rows):
+    """Per-bin sums and counts of the selected rows, taken from a precomputed rollup.
+
+    Interior bins come straight from the rollup; the first and last bins are
+    recomputed from the raw rows since a filter may only cover them partly.
+    """
+    index = data.df.index
+    step = pd.Timedelta(1, unit=freq)
+    first = index[rows.start].floor(freq)
+    last = index[rows.stop - 1].floor(freq)
+    window = rollup.loc[first:last].copy()
+    for label in {first, last}:
+        bin_lo = max(rows.start, int(index.searchsorted(label, side='left')))
+        bin_hi = min(rows.stop, int(index.searchsorted(label + step, side='left')))
+        for name, values in (('a', data.values_a), ('b', data.values_b)):
+            chunk = values[bin_lo:bin_hi] if values is not None else np.empty(0, dtype=np.float32)
+            valid = ~np.isnan(chunk)
+            window.at[label, f'sum_{name}'] = chunk[valid].sum(dtype=np.float64)
+            window.at[label, f'count_{name}'] = np.count_nonzero(valid)
+    return window
+
+
+def compute_pair(func, args_a, args_b):
+    """Run func for Tour A and Tour B concurrently and return both results.
+
+    The numpy reductions and numba kernels behind the endpoints release the
+    GIL, so the two halves run on separate cores.
+    """
+    future_b = _compute_pool.submit(func, *args_b)
+    result_a = func(*args_a)
+    return result_a, future_b.result()
+
+
+def json_bytes_response(body):
+    """Wrap an already serialized JSON body in a response."""
+    return Response(body, mimetype='application/json')
+
+
+def fixed_width_histogram(values, bins, lo, hi):
+    """Equal-width histogram of NaN-free values spanning [lo, hi], like np.histogram(values, bins).
+
+    Bin indices come from a single multiply-and-cast followed by one
+    bincount, with the same boundary corrections np.histogram applies.
+    """
+    if lo == hi:
+        lo, hi = lo - 0.5, hi + 0.5
+    edges = np.linspace(lo, hi, bins + 1)
+    indices = ((values - lo) * (bins / (hi - lo))).astype(np.intp)
+    np.clip(indices, 0, bins - 1, out=indices)
+    indices -= values < edges[indices]
+    indices += (values >= edges[indices + 1]) & (indices != bins - 1)
+    return np.bincount(indices, minlength=bins), edges
+
+
+def rounded_values(values, decimals=2):
+    """Round a whole array for a response in one go, reporting missing values as 0."""
+    return np.round(np.nan_to_num(np.asarray(values, dtype=np.float64), nan=0.0), decimals)
+
 
 # ============================================================================
 # API ENDPOINTS
@@ -26,54 +161,46 @@ def health_check():
     return jsonify({'status': 'ok', 'message': 'Flask API is running'})
 
 
-@api.route('/data-info', methods=['GET'])
-def get_data_info():
-    """Get information about available data."""
-    df, power_a, power_b = load_all_data()
-    if df is None:
-        return jsonify({'error': 'No data available'}), 500
-
+def build_data_info(data):
+    """Serialized /api/data-info payload."""
     # Get available months
-    months = df.index.to_period('M').unique().astype(str).tolist()
+    months = list(data.month_slices)
 
-    return jsonify({
-        'totalRecords': len(df),
+    return current_app.json.dumps_bytes({
+        'totalRecords': len(data.df),
         'dateRange': {
-            'start': str(df.index.min()),
-            'end': str(df.index.max())
+            'start': str(data.df.index[0]) if len(data.df) else 'NaT',
+            'end': str(data.df.index[-1]) if len(data.df) else 'NaT'
         },
         'availableMonths': months,
-        'tourACoverage': round(100 * power_a.notna().mean(), 1) if power_a is not None else 0,
-        'tourBCoverage': round(100 * power_b.notna().mean(), 1) if power_b is not None else 0
+        'tourACoverage': round(100 * data.power_a.notna().mean(), 1) if data.power_a is not None else 0,
+        'tourBCoverage': round(100 * data.power_b.notna().mean(), 1) if data.power_b is not None else 0
     })
 
 
-@api.route('/summary', methods=['GET'])
-def get_summary():
-    """Get summary statistics for Tour A and Tour B."""
-    df, power_a, power_b = load_all_data()
-    if df is None:
+@api.route('/data-info', methods=['GET'])
+def get_data_info():
+    """Get information about available data."""
+    data = get_data()
+    if data is None:
         return jsonify({'error': 'No data available'}), 500
 
-    # Parse filter parameters
-    month = request.args.get('month')  # Format: YYYY-MM
-    start_date = request.args.get('start_date')  # Format: YYYY-MM-DD
-    end_date = request.args.get('end_date')  # Format: YYYY-MM-DD
+    return json_bytes_response(build_data_info(data))
 
+
+def build_summary(data, month, start_date, end_date):
+    """Serialized /api/summary payload for one set of filters."""
     # Apply filters
-    mask = pd.Series(True, index=df.index)
-    if month:
-        mask &= df.index.to_period('M').astype(str) == month
-    if start_date:
-        mask &= df.index >= pd.to_datetime(start_date)
-    if end_date:
-        mask &= df.index <= pd.to_datetime(end_date)
+    rows = build_filter_slice(data, month=month, start_date=start_date, end_date=end_date)
 
-    filtered_a = power_a[mask].dropna()
-    filtered_b = power_b[mask].dropna()
+    values_a, values_b = data.values_a, data.values_b
+    weekdays = data.dayofweek[rows]
+    selected_points = rows.stop - rows.start
 
-    def calc_metrics(power, name):
-        if len(power) == 0:
+    def calc_metrics(values, name):
+        stats = tour_stats(values, weekdays)
+        count = stats['count']
+        if count == 0:
             return {
                 'name': name,
                 'avgPower': 0,
@@ -89,14 +216,11 @@ def get_summary():
                 'estimatedMonthlyKwh': 0
             }
 
-        avg = power.mean()
-        max_val = power.max()
-        min_val = power[power > 0].min() if (power > 0).any() else 0
-        weekday_avg = power[power.index.dayofweek < 5].mean()
-        weekend_avg = power[power.index.dayofweek >= 5].mean()
+        avg, max_val, min_val = stats['avg'], stats['max'], stats['min']
+        weekday_avg, weekend_avg = stats['weekday_avg'], stats['weekend_avg']
         load_factor = avg / max_val if max_val > 0 else 0
         peak_to_avg = max_val / avg if avg > 0 else 0
-        total_energy = (power.fillna(0) * 0.25).sum()  # 15-min intervals
+        total_energy = stats['total'] * 0.25  # 15-min intervals
 
         return {
             'name': name,
@@ -105,7 +229,7 @@ def get_summary():
             'minPower': round(min_val, 2),
             'weekdayAvg': round(weekday_avg, 2) if not pd.isna(weekday_avg) else 0,
             'weekendAvg': round(weekend_avg, 2) if not pd.isna(weekend_avg) else 0,
-            'dataCoverage': round(100 * len(power) / len(mask[mask]), 1) if mask.sum() > 0 else 0,
+            'dataCoverage': round(100 * count / selected_points, 1) if selected_points > 0 else 0,
             'loadFactor': round(load_factor, 3),
             'peakToAvgRatio': round(peak_to_avg, 2),
             'totalEnergyKwh': round(total_energy, 0),
@@ -113,9 +237,9 @@ def get_summary():
             'estimatedMonthlyKwh': round(avg * 24 * 30, 0)
         }
 
-    return jsonify({
-        'tourA': calc_metrics(filtered_a, 'Tour A'),
-        'tourB': calc_metrics(filtered_b, 'Tour B'),
+    return current_app.json.dumps_bytes({
+        'tourA': calc_metrics(values_a[rows], 'Tour A'),
+        'tourB': calc_metrics(values_b[rows], 'Tour B'),
         'filters': {
             'month': month,
             'startDate': start_date,
@@ -124,11 +248,26 @@ def get_summary():
     })
 
 
+@api.route('/summary', methods=['GET'])
+def get_summary():
+    """Get summary statistics for Tour A and Tour B."""
+    data = get_data()
+    if data is None:
+        return jsonify({'error': 'No data available'}), 500
+
+    # Parse filter parameters
+    month = request.args.get('month')  # Format: YYYY-MM
+    start_date = request.args.get('start_date')  # Format: YYYY-MM-DD
+    end_date = request.args.get('end_date')  # Format: YYYY-MM-DD
+
+    return json_bytes_response(build_summary(data, month, start_date, end_date))
+
+
 @api.route('/hourly', methods=['GET'])
 def get_hourly_data():
     """Get hourly consumption patterns."""
-    df, power_a, power_b = load_all_data()
-    if df is None:
+    data = get_data()
+    if data is None:
         return jsonify({'error': 'No data available'}), 500
 
     # Parse filter parameters
@@ -136,30 +275,23 @@ def get_hourly_data():
     day_of_week = request.args.get('day_of_week')  # 0-6 (Monday-Sunday)
 
     # Apply filters
-    mask = pd.Series(True, index=df.index)
-    if month:
-        mask &= df.index.to_period('M').astype(str) == month
+    sums, counts = month_pattern_totals(data, month=month)
     if day_of_week is not None:
-        mask &= df.index.dayofweek == int(day_of_week)
-
-    filtered_a = power_a[mask]
-    filtered_b = power_b[mask]
-
-    hourly_a = filtered_a.groupby(filtered_a.index.hour).mean()
-    hourly_b = filtered_b.groupby(filtered_b.index.hour).mean()
-
-    hourly_data = []
-    for hour in range(24):
-        a_val = hourly_a.get(hour, 0)
-        b_val = hourly_b.get(hour, 0)
-        a_val = 0 if pd.isna(a_val) else round(a_val, 2)
-        b_val = 0 if pd.isna(b_val) else round(b_val, 2)
-        hourly_data.append({
-            'hour': hour,
-            'tourA': a_val,
-            'tourB': b_val,
-            'difference': round(b_val - a_val, 2)
-        })
+        day = int(day_of_week)
+        if 0 <= day < 7:
+            sums, counts = sums[:, day], counts[:, day]
+        else:
+            sums, counts = np.zeros((2, 24)), np.zeros((2, 24), dtype=np.int64)
+    else:
+        sums, counts = sums.sum(axis=1), counts.sum(axis=1)
+
+    hourly_a, hourly_b = rounded_values(cell_means(sums, counts))
+    hourly_diff = np.round(hourly_b - hourly_a, 2)
+
+    hourly_data = [
+        {'hour': hour, 'tourA': a_val, 'tourB': b_val, 'difference': diff}
+        for hour, (a_val, b_val, diff) in enumerate(zip(hourly_a.tolist(), hourly_b.tolist(), hourly_diff.tolist()))
+    ]
 
     return jsonify({
         'data': hourly_data,
@@ -173,37 +305,23 @@ def get_hourly_data():
 @api.route('/weekly', methods=['GET'])
 def get_weekly_data():
     """Get weekly consumption patterns."""
-    df, power_a, power_b = load_all_data()
-    if df is None:
+    data = get_data()
+    if data is None:
         return jsonify({'error': 'No data available'}), 500
 
     # Parse filter parameters
     month = request.args.get('month')
 
     # Apply filters
-    mask = pd.Series(True, index=df.index)
-    if month:
-        mask &= df.index.to_period('M').astype(str) == month
-
-    filtered_a = power_a[mask]
-    filtered_b = power_b[mask]
+    sums, counts = month_pattern_totals(data, month=month)
 
     days = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-    weekly_a = filtered_a.groupby(filtered_a.index.dayofweek).mean()
-    weekly_b = filtered_b.groupby(filtered_b.index.dayofweek).mean()
-
-    weekly_data = []
-    for i, day in enumerate(days):
-        a_val = weekly_a.get(i, 0)
-        b_val = weekly_b.get(i, 0)
-        a_val = 0 if pd.isna(a_val) else round(a_val, 2)
-        b_val = 0 if pd.isna(b_val) else round(b_val, 2)
-        weekly_data.append({
-            'day': day,
-            'dayIndex': i,
-            'tourA': a_val,
-            'tourB': b_val
-        })
+    weekly_a, weekly_b = rounded_values(cell_means(sums.sum(axis=2), counts.sum(axis=2)))
+
+    weekly_data = [
+        {'day': day, 'dayIndex': i, 'tourA': a_val, 'tourB': b_val}
+        for i, (day, a_val, b_val) in enumerate(zip(days, weekly_a.tolist(), weekly_b.tolist()))
+    ]
 
     return jsonify({
         'data': weekly_data,
@@ -216,39 +334,43 @@ def get_weekly_data():
 @api.route('/monthly', methods=['GET'])
 def get_monthly_data():
     """Get monthly consumption trends."""
-    df, power_a, power_b = load_all_data()
-    if df is None:
+    data = get_data()
+    if data is None:
         return jsonify({'error': 'No data available'}), 500
 
     # Parse filter parameters
     year = request.args.get('year')  # Filter by year
 
     # Apply filters
-    mask = pd.Series(True, index=df.index)
-    if year:
-        mask &= df.index.year == int(year)
-
-    filtered_a = power_a[mask]
-    filtered_b = power_b[mask]
-
-    monthly_a = filtered_a.resample('ME').mean()
-    monthly_b = filtered_b.resample('ME').mean()
-
-    all_months = monthly_a.index.union(monthly_b.index)
-    monthly_data = []
-    for month in sorted(all_months):
-        a_val = monthly_a.get(month, 0)
-        b_val = monthly_b.get(month, 0)
-        a_val = 0 if pd.isna(a_val) else round(a_val, 2)
-        b_val = 0 if pd.isna(b_val) else round(b_val, 2)
-        monthly_data.append({
-            'month': month.strftime('%Y-%m'),
-            'monthName': month.strftime('%b %Y'),
+    months = [label for label in data.month_patterns if not year or label[:4] == f'{int(year):04d}']
+
+    # Monthly means from the per-month patterns; months without readings in between stay in as 0
+    if months:
+        all_months = pd.period_range(months[0], months[-1], freq='M')
+        totals = [month_pattern_totals(data, month=label) for label in all_months.strftime('%Y-%m')]
+        sums = np.array([month_sums.sum(axis=(1, 2)) for month_sums, _ in totals])
+        counts = np.array([month_counts.sum(axis=(1, 2)) for _, month_counts in totals])
+        month_a, month_b = rounded_values(cell_means(sums, counts)).T
+    else:
+        month_a = month_b = np.empty(0)
+        all_months = pd.PeriodIndex([], freq='M')
+    energy_a = np.round(month_a * 24 * 30, 0)
+    energy_b = np.round(month_b * 24 * 30, 0)
+
+    monthly_data = [
+        {
+            'month': label,
+            'monthName': name,
             'tourA': a_val,
             'tourB': b_val,
-            'tourAEnergy': round(a_val * 24 * 30, 0),
-            'tourBEnergy': round(b_val * 24 * 30, 0)
-        })
+            'tourAEnergy': a_energy,
+            'tourBEnergy': b_energy
+        }
+        for label, name, a_val, b_val, a_energy, b_energy in zip(
+            all_months.strftime('%Y-%m'), all_months.strftime('%b %Y'),
+            month_a.tolist(), month_b.tolist(), energy_a.tolist(), energy_b.tolist()
+        )
+    ]
 
     return jsonify({
         'data': monthly_data,
@@ -261,8 +383,8 @@ def get_monthly_data():
 @api.route('/timeseries', methods=['GET'])
 def get_timeseries_data():
     """Get time series data (daily averages)."""
-    df, power_a, power_b = load_all_data()
-    if df is None:
+    data = get_data()
+    if data is None:
         return jsonify({'error': 'No data available'}), 500
 
     # Parse filter parameters
@@ -272,47 +394,35 @@ def get_timeseries_data():
     aggregation = request.args.get('aggregation', 'daily')  # daily, hourly, weekly
 
     # Apply filters
-    mask = pd.Series(True, index=df.index)
-    if month:
-        mask &= df.index.to_period('M').astype(str) == month
-    if start_date:
-        mask &= df.index >= pd.to_datetime(start_date)
-    if end_date:
-        mask &= df.index <= pd.to_datetime(end_date)
-
-    filtered_a = power_a[mask]
-    filtered_b = power_b[mask]
+    rows = build_filter_slice(data, month=month, start_date=start_date, end_date=end_date)
 
-    # Resample based on aggregation
+    # Hourly and daily come from the precomputed rollups; weekly and monthly
+    # are re-aggregated from the daily one
     if aggregation == 'hourly':
-        resampled_a = filtered_a.resample('H').mean()
-        resampled_b = filtered_b.resample('H').mean()
-        date_format = '%Y-%m-%d %H:00'
+        freq, rule, date_format = 'h', None, '%Y-%m-%d %H:00'
     elif aggregation == 'weekly':
-        resampled_a = filtered_a.resample('W').mean()
-        resampled_b = filtered_b.resample('W').mean()
-        date_format = '%Y-%m-%d'
+        freq, rule, date_format = 'D', 'W', '%Y-%m-%d'
     elif aggregation == 'monthly':
-        resampled_a = filtered_a.resample('M').mean()
-        resampled_b = filtered_b.resample('M').mean()
-        date_format = '%Y-%m'
+        freq, rule, date_format = 'D', 'ME', '%Y-%m'
     else:  # daily
-        resampled_a = filtered_a.resample('D').mean()
-        resampled_b = filtered_b.resample('D').mean()
-        date_format = '%Y-%m-%d'
-
-    all_dates = resampled_a.index.union(resampled_b.index)
-    timeseries_data = []
-    for date in sorted(all_dates):
-        a_val = resampled_a.get(date, 0)
-        b_val = resampled_b.get(date, 0)
-        a_val = 0 if pd.isna(a_val) else round(a_val, 2)
-        b_val = 0 if pd.isna(b_val) else round(b_val, 2)
-        timeseries_data.append({
-            'date': date.strftime(date_format),
-            'tourA': a_val,
-            'tourB': b_val
-        })
+        freq, rule, date_format = 'D', None, '%Y-%m-%d'
+
+    if rows.stop > rows.start:
+        window = rollup_window(data, data.hourly if freq == 'h' else data.daily, freq, rows)
+        if rule is not None:
+            window = window.resample(rule).sum()
+    else:
+        window = data.daily.iloc[:0]
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        series_a = rounded_values(window['sum_a'].to_numpy() / window['count_a'].to_numpy())
+        series_b = rounded_values(window['sum_b'].to_numpy() / window['count_b'].to_numpy())
+    all_dates = window.index
+
+    timeseries_data = [
+        {'date': date, 'tourA': a_val, 'tourB': b_val}
+        for date, a_val, b_val in zip(all_dates.strftime(date_format), series_a.tolist(), series_b.tolist())
+    ]
 
     return jsonify({
         'data': timeseries_data,
@@ -328,43 +438,46 @@ def get_timeseries_data():
 @api.route('/insights', methods=['GET'])
 def get_insights():
     """Get key insights based on the data."""
-    df, power_a, power_b = load_all_data()
-    if df is None:
+    data = get_data()
+    if data is None:
         return jsonify({'error': 'No data available'}), 500
 
     # Parse filter parameters
     month = request.args.get('month')
 
     # Apply filters
-    mask = pd.Series(True, index=df.index)
-    if month:
-        mask &= df.index.to_period('M').astype(str) == month
+    rows = build_filter_slice(data, month=month)
 
-    filtered_a = power_a[mask].dropna()
-    filtered_b = power_b[mask].dropna()
+    weekdays = data.dayofweek[rows]
+    stats_a = tour_stats(data.values_a[rows], weekdays)
+    stats_b = tour_stats(data.values_b[rows], weekdays)
+    selected_points = rows.stop - rows.start
+    count_a = stats_a['count']
+    count_b = stats_b['count']
 
-    avg_a = filtered_a.mean() if len(filtered_a) > 0 else 0
-    avg_b = filtered_b.mean() if len(filtered_b) > 0 else 0
+    avg_a = stats_a['avg'] if count_a > 0 else 0
+    avg_b = stats_b['avg'] if count_b > 0 else 0
 
     efficiency_diff = abs((avg_a - avg_b) / avg_a * 100) if avg_a > 0 else 0
     more_efficient = 'Tour A' if avg_a < avg_b else 'Tour B'
 
-    weekday_a = filtered_a[filtered_a.index.dayofweek < 5].mean() if len(filtered_a) > 0 else 0
-    weekend_a = filtered_a[filtered_a.index.dayofweek >= 5].mean() if len(filtered_a) > 0 else 0
-    weekday_b = filtered_b[filtered_b.index.dayofweek < 5].mean() if len(filtered_b) > 0 else 0
-    weekend_b = filtered_b[filtered_b.index.dayofweek >= 5].mean() if len(filtered_b) > 0 else 0
+    weekday_a, weekend_a = (stats_a['weekday_avg'], stats_a['weekend_avg']) if count_a > 0 else (0, 0)
+    weekday_b, weekend_b = (stats_b['weekday_avg'], stats_b['weekend_avg']) if count_b > 0 else (0, 0)
 
     weekend_savings_a = ((weekday_a - weekend_a) / weekday_a * 100) if weekday_a > 0 else 0
     weekend_savings_b = ((weekday_b - weekend_b) / weekday_b * 100) if weekday_b > 0 else 0
 
-    hourly_a = filtered_a.groupby(filtered_a.index.hour).mean() if len(filtered_a) > 0 else pd.Series()
-    hourly_b = filtered_b.groupby(filtered_b.index.hour).mean() if len(filtered_b) > 0 else pd.Series()
+    # Hourly means from the precomputed month patterns
+    sums, counts = month_pattern_totals(data, month=month)
+    hourly_a, hourly_b = cell_means(sums.sum(axis=1), counts.sum(axis=1))
 
-    peak_hour_a = int(hourly_a.idxmax()) if len(hourly_a) > 0 else 0
-    peak_hour_b = int(hourly_b.idxmax()) if len(hourly_b) > 0 else 0
+    peak_hour_a = int(np.nanargmax(hourly_a)) if count_a > 0 else 0
+    peak_hour_b = int(np.nanargmax(hourly_b)) if count_b > 0 else 0
 
-    load_factor_a = avg_a / filtered_a.max() if len(filtered_a) > 0 and filtered_a.max() > 0 else 0
-    load_factor_b = avg_b / filtered_b.max() if len(filtered_b) > 0 and filtered_b.max() > 0 else 0
+    max_a = stats_a['max'] if count_a > 0 else 0
+    max_b = stats_b['max'] if count_b > 0 else 0
+    load_factor_a = avg_a / max_a if max_a > 0 else 0
+    load_factor_b = avg_b / max_b if max_b > 0 else 0
 
     insights = [
         {
@@ -399,7 +512,7 @@ def get_insights():
         },
         {
             'title': 'Data Coverage',
-            'value': f'{100*len(filtered_a)/len(mask[mask]):.0f}% / {100*len(filtered_b)/len(mask[mask]):.0f}%' if mask.sum() > 0 else '0% / 0%',
+            'value': f'{100*count_a/selected_points:.0f}% / {100*count_b/selected_points:.0f}%' if selected_points > 0 else '0% / 0%',
             'description': 'Available data percentage for Tour A / Tour B',
             'icon': '📁'
         }
@@ -416,42 +529,29 @@ def get_insights():
 @api.route('/heatmap', methods=['GET'])
 def get_heatmap_data():
     """Get heatmap data (hour vs day of week)."""
-    df, power_a, power_b = load_all_data()
-    if df is None:
+    data = get_data()
+    if data is None:
         return jsonify({'error': 'No data available'}), 500
 
     # Parse filter parameters
     month = request.args.get('month')
 
     # Apply filters
-    mask = pd.Series(True, index=df.index)
-    if month:
-        mask &= df.index.to_period('M').astype(str) == month
-
-    filtered_a = power_a[mask]
-    filtered_b = power_b[mask]
+    sums, counts = month_pattern_totals(data, month=month)
 
     days = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+    means_a, means_b = rounded_values(cell_means(sums, counts)).tolist()
 
-    def create_heatmap(power_series):
-        heatmap_data = []
-        for day_idx in range(7):
-            day_data = power_series[power_series.index.dayofweek == day_idx]
-            for hour in range(24):
-                hour_data = day_data[day_data.index.hour == hour]
-                val = hour_data.mean() if len(hour_data) > 0 else 0
-                val = 0 if pd.isna(val) else round(val, 2)
-                heatmap_data.append({
-                    'day': days[day_idx],
-                    'dayIndex': day_idx,
-                    'hour': hour,
-                    'value': val
-                })
-        return heatmap_data
+    def create_heatmap(means):
+        return [
+            {'day': days[day_idx], 'dayIndex': day_idx, 'hour': hour, 'value': means[day_idx][hour]}
+            for day_idx in range(7)
+            for hour in range(24)
+        ]
 
     return jsonify({
-        'tourA': create_heatmap(filtered_a),
-        'tourB': create_heatmap(filtered_b),
+        'tourA': create_heatmap(means_a),
+        'tourB': create_heatmap(means_b),
         'filters': {
             'month': month
         }
@@ -461,8 +561,8 @@ def get_heatmap_data():
 @api.route('/distribution', methods=['GET'])
 def get_distribution_data():
     """Get distribution statistics for power consumption."""
-    df, power_a, power_b = load_all_data()
-    if df is None:
+    data = get_data()
+    if data is None:
         return jsonify({'error': 'No data available'}), 500
 
     # Parse filter parameters
@@ -472,19 +572,15 @@ def get_distribution_data():
     bins = int(request.args.get('bins', 30))  # Number of bins for histogram
 
     # Apply filters
-    mask = pd.Series(True, index=df.index)
-    if month:
-        mask &= df.index.to_period('M').astype(str) == month
-    if start_date:
-        mask &= df.index >= pd.to_datetime(start_date)
-    if end_date:
-        mask &= df.index <= pd.to_datetime(end_date)
+    rows = build_filter_slice(data, month=month, start_date=start_date, end_date=end_date)
 
-    filtered_a = power_a[mask].dropna()
-    filtered_b = power_b[mask].dropna()
+    window_a = data.values_a[rows]
+    window_b = data.values_b[rows]
+    filtered_a = window_a[~np.isnan(window_a)]
+    filtered_b = window_b[~np.isnan(window_b)]
 
-    def calc_distribution(power, name):
-        if len(power) == 0:
+    def calc_distribution(values, name):
+        if len(values) == 0:
             return {
                 'name': name,
                 'histogram': [],
@@ -493,33 +589,40 @@ def get_distribution_data():
                 'statistics': {}
             }
 
+        # Mean, spread, shape and extremes in one kernel call
+        count, mean, variance, skewness, kurtosis, min_val, max_val = power_moments(values)
+
         # Calculate histogram
-        hist, bin_edges = np.histogram(power, bins=bins)
-        histogram_data = []
-        for i in range(len(hist)):
-            histogram_data.append({
-                'binStart': round(bin_edges[i], 2),
-                'binEnd': round(bin_edges[i + 1], 2),
-                'binCenter': round((bin_edges[i] + bin_edges[i + 1]) / 2, 2),
-                'count': int(hist[i]),
-                'frequency': round(hist[i] / len(power) * 100, 2)
-            })
-
-        # Calculate percentiles
+        hist, bin_edges = fixed_width_histogram(values, bins, min_val, max_val)
+        edges = np.round(bin_edges, 2).tolist()
+        centers = np.round((bin_edges[:-1] + bin_edges[1:]) / 2, 2).tolist()
+        frequencies = np.round(hist / len(values) * 100, 2).tolist()
+        histogram_data = [
+            {
+                'binStart': edges[i],
+                'binEnd': edges[i + 1],
+                'binCenter': centers[i],
+                'count': count,
+                'frequency': frequencies[i]
+            }
+            for i, count in enumerate(hist.tolist())
+        ]
+
+        # Calculate percentiles (one partition of the data for all of them)
+        p5, p10, q1, q2, q3, p90, p95 = np.quantile(
+            values, [0.05, 0.10, 0.25, 0.50, 0.75, 0.90, 0.95]
+        )
         percentiles = {
-            'p5': round(np.percentile(power, 5), 2),
-            'p10': round(np.percentile(power, 10), 2),
-            'p25': round(np.percentile(power, 25), 2),
-            'p50': round(np.percentile(power, 50), 2),
-            'p75': round(np.percentile(power, 75), 2),
-            'p90': round(np.percentile(power, 90), 2),
-            'p95': round(np.percentile(power, 95), 2)
+            'p5': round(p5, 2),
+            'p10': round(p10, 2),
+            'p25': round(q1, 2),
+            'p50': round(q2, 2),
+            'p75': round(q3, 2),
+            'p90': round(p90, 2),
+            'p95': round(p95, 2)
         }
 
         # Calculate quartiles
-        q1 = np.percentile(power, 25)
-        q2 = np.percentile(power, 50)
-        q3 = np.percentile(power, 75)
         iqr = q3 - q1
 
         quartiles = {
@@ -527,23 +630,27 @@ def get_distribution_data():
             'q2': round(q2, 2),
             'q3': round(q3, 2),
             'iqr': round(iqr, 2),
-            'lowerWhisker': round(max(power.min(), q1 - 1.5 * iqr), 2),
-            'upperWhisker': round(min(power.max(), q3 + 1.5 * iqr), 2)
+            'lowerWhisker': round(max(min_val, q1 - 1.5 * iqr), 2),
+            'upperWhisker': round(min(max_val, q3 + 1.5 * iqr), 2)
         }
 
+        # Most frequent value (the smallest one on ties, like Series.mode()[0])
+        unique_values, value_counts = np.unique(values, return_counts=True)
+        mode = unique_values[np.argmax(value_counts)]
+
         # Calculate statistics
         statistics = {
-            'mean': round(power.mean(), 2),
-            'median': round(power.median(), 2),
-            'mode': round(power.mode()[0] if len(power.mode()) > 0 else power.median(), 2),
-            'std': round(power.std(), 2),
-            'variance': round(power.var(), 2),
-            'skewness': round(power.skew(), 2),
-            'kurtosis': round(power.kurtosis(), 2),
-            'min': round(power.min(), 2),
-            'max': round(power.max(), 2),
-            'range': round(power.max() - power.min(), 2),
-            'count': len(power)
+            'mean': round(mean, 2),
+            'median': round(q2, 2),
+            'mode': round(mode, 2),
+            'std': round(np.sqrt(variance), 2),
+            'variance': round(variance, 2),
+            'skewness': round(skewness, 2),
+            'kurtosis': round(kurtosis, 2),
+            'min': round(min_val, 2),
+            'max': round(max_val, 2),
+            'range': round(max_val - min_val, 2),
+            'count': count
         }
 
         return {
@@ -554,9 +661,13 @@ def get_distribution_data():
             'statistics': statistics
         }
 
+    distribution_a, distribution_b = compute_pair(
+        calc_distribution, (filtered_a, 'Tour A'), (filtered_b, 'Tour B')
+    )
+
     return jsonify({
-        'tourA': calc_distribution(filtered_a, 'Tour A'),
-        'tourB': calc_distribution(filtered_b, 'Tour B'),
+        'tourA': distribution_a,
+        'tourB': distribution_b,
         'filters': {
             'month': month,
             'startDate': start_date,
@@ -569,8 +680,8 @@ def get_distribution_data():
 @api.route('/peak-analysis', methods=['GET'])
 def get_peak_analysis():
     """Get peak and off-peak hours analysis."""
-    df, power_a, power_b = load_all_data()
-    if df is None:
+    data = get_data()
+    if data is None:
         return jsonify({'error': 'No data available'}), 500
 
     # Parse filter parameters
@@ -580,18 +691,13 @@ def get_peak_analysis():
     top_n = int(request.args.get('top_n', 5))
 
     # Apply filters
-    mask = pd.Series(True, index=df.index)
-    if month:
-        mask &= df.index.to_period('M').astype(str) == month
-    if start_date:
-        mask &= df.index >= pd.to_datetime(start_date)
-    if end_date:
-        mask &= df.index <= pd.to_datetime(end_date)
+    rows = build_filter_slice(data, month=month, start_date=start_date, end_date=end_date)
 
-    filtered_a = power_a[mask].dropna()
-    filtered_b = power_b[mask].dropna()
+    filtered_a = data.power_a.iloc[rows].dropna()
+    filtered_b = data.power_b.iloc[rows].dropna()
+    hours = data.hour[rows]
 
-    def analyze_peaks(power, name):
+    def analyze_peaks(power, values, name):
         if len(power) == 0:
             return {
                 'name': name,
@@ -606,8 +712,8 @@ def get_peak_analysis():
                 }
             }
 
-        # Hourly averages
-        hourly_avg = power.groupby(power.index.hour).mean()
+        # Hourly averages (hours without data are left out)
+        hourly_avg = pd.Series(group_nanmean(values, hours, 24)).dropna()
 
         # Peak hours (top N)
         peak_hours = hourly_avg.nlargest(top_n)
@@ -633,14 +739,18 @@ def get_peak_analysis():
 
         # Daily peak analysis
         daily_max = power.resample('D').max()
-        daily_peaks_hist, bins = np.histogram(daily_max.dropna(), bins=20)
+        daily_max_values = daily_max.dropna().to_numpy(dtype=np.float64)
+        daily_peaks_hist, bins = fixed_width_histogram(
+            daily_max_values, 20, daily_max_values.min(), daily_max_values.max()
+        )
+        peak_edges = np.round(bins, 2).tolist()
         daily_peaks_distribution = [
             {
-                'binStart': round(bins[i], 2),
-                'binEnd': round(bins[i + 1], 2),
-                'count': int(daily_peaks_hist[i])
+                'binStart': peak_edges[i],
+                'binEnd': peak_edges[i + 1],
+                'count': count
             }
-            for i in range(len(daily_peaks_hist))
+            for i, count in enumerate(daily_peaks_hist.tolist())
         ]
 
         return {
@@ -656,9 +766,13 @@ def get_peak_analysis():
             }
         }
 
+    peaks_a, peaks_b = compute_pair(
+        analyze_peaks, (filtered_a, data.values_a[rows], 'Tour A'), (filtered_b, data.values_b[rows], 'Tour B')
+    )
+
     return jsonify({
-        'tourA': analyze_peaks(filtered_a, 'Tour A'),
-        'tourB': analyze_peaks(filtered_b, 'Tour B'),
+        'tourA': peaks_a,
+        'tourB': peaks_b,
         'filters': {
             'month': month,
             'startDate': start_date,
@@ -671,8 +785,8 @@ def get_peak_analysis():
 @api.route('/data-quality', methods=['GET'])
 def get_data_quality():
     """Get data quality report."""
-    df, power_a, power_b = load_all_data()
-    if df is None:
+    data = get_data()
+    if data is None:
         return jsonify({'error': 'No data available'}), 500
 
     # Parse filter parameters
@@ -681,23 +795,16 @@ def get_data_quality():
     end_date = request.args.get('end_date')
 
     # Apply filters
-    mask = pd.Series(True, index=df.index)
-    if month:
-        mask &= df.index.to_period('M').astype(str) == month
-    if start_date:
-        mask &= df.index >= pd.to_datetime(start_date)
-    if end_date:
-        mask &= df.index <= pd.to_datetime(end_date)
+    rows = build_filter_slice(data, month=month, start_date=start_date, end_date=end_date)
 
-    filtered_a = power_a[mask]
-    filtered_b = power_b[mask]
+    values_a, values_b = data.values_a, data.values_b
 
-    def calc_quality(power, name):
-        total_points = len(power)
-        non_null = int(power.notna().sum())
-        null_count = int(power.isna().sum())
-        zero_count = int((power == 0).sum())
-        non_zero_count = int((power > 0).sum())
+    def calc_quality(values, name):
+        total_points = len(values)
+        non_null = int(np.count_nonzero(~np.isnan(values)))
+        null_count = total_points - non_null
+        zero_count = int(np.count_nonzero(values == 0))
+        non_zero_count = int(np.count_nonzero(values > 0))
 
         return {
             'name': name,
@@ -712,8 +819,8 @@ def get_data_quality():
             'issues': []
         }
 
-    quality_a = calc_quality(filtered_a, 'Tour A')
-    quality_b = calc_quality(filtered_b, 'Tour B')
+    quality_a = calc_quality(values_a[rows], 'Tour A')
+    quality_b = calc_quality(values_b[rows], 'Tour B')
 
     # Add issues
     if quality_a['completeness'] < 50:
@@ -739,8 +846,8 @@ def get_data_quality():
 @api.route('/comparison', methods=['GET'])
 def get_comparison_metrics():
     """Get detailed comparison metrics between tours."""
-    df, power_a, power_b = load_all_data()
-    if df is None:
+    data = get_data()
+    if data is None:
         return jsonify({'error': 'No data available'}), 500
 
     # Parse filter parameters
@@ -749,44 +856,45 @@ def get_comparison_metrics():
     end_date = request.args.get('end_date')
 
     # Apply filters
-    mask = pd.Series(True, index=df.index)
-    if month:
-        mask &= df.index.to_period('M').astype(str) == month
-    if start_date:
-        mask &= df.index >= pd.to_datetime(start_date)
-    if end_date:
-        mask &= df.index <= pd.to_datetime(end_date)
+    rows = build_filter_slice(data, month=month, start_date=start_date, end_date=end_date)
 
-    filtered_a = power_a[mask].dropna()
-    filtered_b = power_b[mask].dropna()
+    values_a, values_b = data.values_a, data.values_b
+    window_a = values_a[rows]
+    window_b = values_b[rows]
+    valid_a = ~np.isnan(window_a)
+    valid_b = ~np.isnan(window_b)
 
-    if len(filtered_a) == 0 or len(filtered_b) == 0:
+    if not valid_a.any() or not valid_b.any():
         return jsonify({'error': 'Insufficient data for comparison'}), 400
 
-    # Align data on common time indices
-    common_index = filtered_a.index.intersection(filtered_b.index)
-    aligned_a = filtered_a[common_index]
-    aligned_b = filtered_b[common_index]
+    # Both tours share the data index, so the common time points are the rows valid in both
+    both_valid = valid_a & valid_b
+    aligned_a = window_a[both_valid]
+    aligned_b = window_b[both_valid]
+    has_common = len(aligned_a) > 0
 
     # Calculate comparison metrics
-    avg_a = aligned_a.mean()
-    avg_b = aligned_b.mean()
+    avg_a = aligned_a.mean(dtype=np.float64) if has_common else np.nan
+    avg_b = aligned_b.mean(dtype=np.float64) if has_common else np.nan
     diff_abs = avg_b - avg_a
     diff_pct = (diff_abs / avg_a * 100) if avg_a > 0 else 0
 
     # Correlation
-    correlation = aligned_a.corr(aligned_b) if len(aligned_a) > 1 else 0
+    with np.errstate(invalid='ignore', divide='ignore'):
+        correlation = np.corrcoef(aligned_a, aligned_b)[0, 1] if len(aligned_a) > 1 else 0
+
+    # Higher-tour counts and hourly B - A differences in a single pass
+    common_hours = data.hour[rows][both_valid]
+    a_higher_count, b_higher_count, hourly_diff = compare_pass(aligned_a, aligned_b, common_hours)
 
     # Hourly comparison
-    hourly_a = aligned_a.groupby(aligned_a.index.hour).mean()
-    hourly_b = aligned_b.groupby(aligned_b.index.hour).mean()
-    hourly_diff = hourly_b - hourly_a
+    hourly_diff = pd.Series(hourly_diff).dropna()
     max_diff_hour = int(hourly_diff.abs().idxmax()) if len(hourly_diff) > 0 else 0
     max_diff_value = hourly_diff[max_diff_hour] if len(hourly_diff) > 0 else 0
 
     # Peak comparison
-    peak_a = aligned_a.max()
-    peak_b = aligned_b.max()
+    peak_a = aligned_a.max() if has_common else np.nan
+    peak_b = aligned_b.max() if has_common else np.nan
     peak_diff_pct = ((peak_b - peak_a) / peak_a * 100) if peak_a > 0 else 0
 
     # Efficiency comparison
@@ -795,8 +903,6 @@ def get_comparison_metrics():
     efficiency_winner = 'Tour A' if load_factor_a > load_factor_b else 'Tour B'
 
     # Time periods when each is higher
-    a_higher_count = (aligned_a > aligned_b).sum()
-    b_higher_count = (aligned_b > aligned_a).sum()
     a_higher_pct = (a_higher_count / len(aligned_a) * 100) if len(aligned_a) > 0 else 0
     b_higher_pct = (b_higher_count / len(aligned_b) * 100) if len(aligned_b) > 0 else 0
 
@@ -837,7 +943,7 @@ def get_comparison_metrics():
         },
         'dataPoints': {
             'total': len(aligned_a),
-            'commonTimePoints': len(common_index)
+            'commonTimePoints': len(aligned_a)
         },
         'filters': {
             'month': month,
@@ -850,8 +956,8 @@ def get_comparison_metrics():
 @api.route('/cumulative-energy', methods=['GET'])
 def get_cumulative_energy():
     """Get cumulative energy consumption over time with date range selection."""
-    df, power_a, power_b = load_all_data()
-    if df is None:
+    data = get_data()
+    if data is None:
         return jsonify({'error': 'No data available'}), 500
 
     # Parse filter parameters
@@ -860,14 +966,11 @@ def get_cumulative_energy():
     aggregation = request.args.get('aggregation', 'hourly')  # hourly, daily, weekly
 
     # Apply filters
-    mask = pd.Series(True, index=df.index)
-    if start_date:
-        mask &= df.index >= pd.to_datetime(start_date)
-    if end_date:
-        mask &= df.index <= pd.to_datetime(end_date)
+    rows = build_filter_slice(data, start_date=start_date, end_date=end_date)
 
-    filtered_a = power_a[mask].fillna(0)
-    filtered_b = power_b[mask].fillna(0)
+    # Accumulate in float64: a float32 running total drifts over months of readings
+    filtered_a = data.power_a.iloc[rows].astype(np.float64).fillna(0)
+    filtered_b = data.power_b.iloc[rows].astype(np.float64).fillna(0)
 
     # Calculate cumulative energy (power * time interval in hours)
     # Assuming 15-minute intervals = 0.25 hours
@@ -890,17 +993,12 @@ def get_cumulative_energy():
 
     # Combine into response
     all_dates = energy_a.index.union(energy_b.index)
-    cumulative_data = []
-    for date in sorted(all_dates):
-        a_val = energy_a.get(date, 0)
-        b_val = energy_b.get(date, 0)
-        a_val = 0 if pd.isna(a_val) else round(a_val, 2)
-        b_val = 0 if pd.isna(b_val) else round(b_val, 2)
-        cumulative_data.append({
-            'date': date.strftime(date_format),
-            'tourA': a_val,
-            'tourB': b_val
-        })
+    cumulative_a = rounded_values(energy_a.reindex(all_dates))
+    cumulative_b = rounded_values(energy_b.reindex(all_dates))
+    cumulative_data = [
+        {'date': date, 'tourA': a_val, 'tourB': b_val}
+        for date, a_val, b_val in zip(all_dates.strftime(date_format), cumulative_a.tolist(), cumulative_b.tolist())
+    ]
 
     return jsonify({
         'data': cumulative_data,
@@ -929,8 +1027,8 @@ def get_forecasting():
     except ImportError as e:
         return jsonify({'error': f'Forecasting models not available: {str(e)}'}), 500
     
-    df, power_a, power_b = load_all_data()
-    if df is None:
+    data = get_data()
+    if data is None:
         return jsonify({'error': 'No data available'}), 500
 
     # Parse filter parameters
@@ -938,6 +1036,8 @@ def get_forecasting():
     start_date = request.args.get('start_date')
     end_date = request.args.get('end_date')
 
+    power_a, power_b = data.power_a, data.power_b
+
     # For forecasting, we should NOT apply date filters to training data
     # Instead, use all available historical data for better predictions
     # The filters are only for displaying/validating against actual future data
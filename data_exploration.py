@@ -12,11 +12,15 @@ Meters/Counters Reference (from Metadonnees_13compteurs.pdf):
 """
 
 import os
+import re
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pacsv
 import matplotlib.pyplot as plt
 import seaborn as sns
 import warnings
+from concurrent.futures import ProcessPoolExecutor
 
 warnings.filterwarnings('ignore')
 
@@ -24,6 +28,33 @@ warnings.filterwarnings('ignore')
 plt.style.use('seaborn-v0_8-whitegrid')
 sns.set_palette("husl")
 
+# Trailing numeric suffix of XLSX column names (optional whitespace and digits)
+_NUMERIC_SUFFIX_RE = re.compile(r'\s*\d+$')
+
+# Column name prefixes of each tour's meters
+_TOUR_PREFIXES = {
+    # Tour A main meter and climate
+    'A': ('TOUR_A_(TGBT_D14)', 'CLIM_TOUR_A_(TGBT_D6)'),
+    # Tour B main meter, heat pump, and room meters
+    'B': ('Tour_B_(TGBT_D5)', 'SALLE_B101', 'SALLE_B112', 'SALLE_B201'),
+}
+
+# Metric keywords of the column names, and the (keyword, aggregation, metric) rules
+# get_key_metrics_columns applies in order; the first matching rule classifies a column
+_METRIC_KIND_RE = re.compile(r'kw sys|kwh|kvar sys|pf sys|a l[123]')
+_METRIC_RULES = (
+    ('kw sys', 'avg', 'power_avg'),
+    ('kwh', 'abs', 'energy'),
+    ('kvar sys', 'avg', 'reactive_power'),
+    ('pf sys', 'avg', 'power_factor'),
+    ('a l1', 'avg', 'current_l1'),
+    ('a l2', 'avg', 'current_l2'),
+    ('a l3', 'avg', 'current_l3'),
+)
+
+# Placeholders the meters write for missing readings
+_NULL_VALUES = ['---', '', ' ']
+
 
 # ============================================================================
 # 1. DATA LOADING FUNCTIONS
@@ -40,35 +71,66 @@ def get_csv_files(data_dir):
         List of paths to all CSV files
     """
     csv_files = []
-    for root, dirs, files in os.walk(data_dir):
-        for file in files:
-            if file.endswith('.csv') or file.endswith('.xlsx'):
-                csv_files.append(os.path.join(root, file))
+    # Walk the tree with scandir, whose entries carry their file type already
+    pending = [data_dir] if os.path.isdir(data_dir) else []
+    while pending:
+        with os.scandir(pending.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                elif entry.name.endswith(('.csv', '.xlsx')) and entry.is_file():
+                    csv_files.append(entry.path)
     return sorted(csv_files)
 
 
-def normalize_column_name(col_name):
+def normalize_column_names(columns):
     """
     Normalize column names by removing trailing numeric suffixes.
     
     XLSX files have numeric suffixes (e.g., 'TOUR_A_(TGBT_D14) kW sys (kW) [AVG] 877')
     while CSV files don't (e.g., 'TOUR_A_(TGBT_D14) kW sys (kW) [AVG] ')
-    This function strips trailing numbers to ensure consistent column names.
+    This function strips trailing numbers to ensure consistent column names,
+    working on the whole column Index at once.
     
     Args:
-        col_name: Original column name
+        columns: Original column names
         
     Returns:
-        Normalized column name
+        Index of normalized column names
     """
-    import re
-    # Remove trailing whitespace and digits
-    # Pattern: ends with optional whitespace and digits
-    normalized = re.sub(r'\s*\d+$', '', str(col_name).strip())
+    # Remove surrounding whitespace and trailing digits
+    names = pd.Index(columns).astype(str).str.strip().str.replace(_NUMERIC_SUFFIX_RE, '', regex=True)
     # Ensure trailing space for consistency with CSV files
-    if not normalized.endswith(' ') and not normalized in ['Date', 'Time']:
-        normalized = normalized + ' '
-    return normalized
+    keep = names.isin(['Date', 'Time']) | names.str.endswith(' ')
+    return names.where(keep, names + ' ')
+
+
+def read_csv_file(file_path):
+    """
+    Read a semicolon-separated CSV file with the multithreaded PyArrow parser.
+    
+    Falls back to pandas if PyArrow cannot parse the file.
+    
+    Args:
+        file_path: Path to the CSV file
+        
+    Returns:
+        DataFrame with the raw columns
+    """
+    try:
+        table = pacsv.read_csv(
+            file_path,
+            parse_options=pacsv.ParseOptions(delimiter=';'),
+            convert_options=pacsv.ConvertOptions(
+                # Keep Date/Time as text; they are parsed into the index afterwards
+                column_types={'Date': pa.string(), 'Time': pa.string()},
+                null_values=_NULL_VALUES,
+                strings_can_be_null=True
+            )
+        )
+    except pa.ArrowInvalid:
+        return pd.read_csv(file_path, sep=';', low_memory=False)
+    return table.to_pandas(split_blocks=True, self_destruct=True)
 
 
 def load_single_csv(file_path):
@@ -83,14 +145,14 @@ def load_single_csv(file_path):
     """
     try:
         if file_path.endswith('.csv'):
-            df = pd.read_csv(file_path, sep=';', low_memory=False)
+            df = read_csv_file(file_path)
         elif file_path.endswith('.xlsx'):
-            df = pd.read_excel(file_path)
-            # convert Date column from yyyy-mm-dd hh:mm:ss to dd-mm-yyyy
+            df = pd.read_excel(file_path, na_values=_NULL_VALUES)
+            # Date column is read as yyyy-mm-dd hh:mm:ss; keep only the day
             if 'Date' in df.columns and 'Time' in df.columns:
-                df['Date'] = pd.to_datetime(df['Date']).dt.strftime('%d-%m-%Y')
+                df['Date'] = pd.to_datetime(df['Date']).dt.normalize()
             # Normalize column names to remove numeric suffixes
-            df.columns = [normalize_column_name(col) for col in df.columns]
+            df.columns = normalize_column_names(df.columns)
         else:
             print(f"❌ Unsupported file type: {file_path}")
             return None
@@ -98,49 +160,72 @@ def load_single_csv(file_path):
         if 'Date' in df.columns and 'Time' in df.columns:
             mask = ~(df['Time'] == '24:00:00')
             df = df[mask]
-            df['Datetime'] = pd.to_datetime(
-                df['Date'] + ' ' + df['Time'], 
-                format='%d-%m-%Y %H:%M:%S',
-                errors='coerce'
-            )
-            df.set_index('Datetime', inplace=True)
-            df.drop(['Date', 'Time'], axis=1, inplace=True)
+            # Parse dates (repeated 96 times a day, so cached) and times separately
+            # and add them, instead of concatenating and parsing one string per row
+            dates = pd.to_datetime(df['Date'], format='%d-%m-%Y', cache=True, errors='coerce')
+            # Only 96 distinct times of day: parse each once and map back through the codes
+            time_codes, unique_times = pd.factorize(df['Time'])
+            offsets = pd.to_timedelta(unique_times.astype(str), errors='coerce').to_numpy()
+            # Missing times get code -1, which picks up the trailing NaT
+            times = np.append(offsets, np.timedelta64('NaT', 'ns'))[time_codes]
+            df = df.drop(['Date', 'Time'], axis=1)
+            df.index = pd.DatetimeIndex(dates.to_numpy() + times, name='Datetime')
         return df
     except Exception as e:
         print(f"Error loading {file_path}: {e}")
         return None
 
 
+def load_single_table(file_path):
+    """
+    Load a single data file as a PyArrow table.
+    
+    Args:
+        file_path: Path to the CSV or XLSX file
+        
+    Returns:
+        Table with the parsed data and its Datetime index as a column, or None
+    """
+    df = load_single_csv(file_path)
+    if df is None:
+        return None
+    try:
+        return pa.Table.from_pandas(df, preserve_index=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Columns mixing numbers and text are kept as text; clean_numeric_data converts them later
+        text_cols = df.select_dtypes(include='object').columns
+        return pa.Table.from_pandas(df.astype(dict.fromkeys(text_cols, 'string')), preserve_index=True)
+
+
 def load_all_data(data_dir):
     csv_files = get_csv_files(data_dir)
     print(f"Found {len(csv_files)} CSV files")
     
-    all_data = []
-    for file_path in csv_files:
-        df = load_single_csv(file_path)
-        if df is not None:
-            nat_count = df.index.isna().sum()
+    # Files are parsed independently, so spread them over worker processes
+    with ProcessPoolExecutor() as executor:
+        loaded = list(executor.map(load_single_table, csv_files))
+
+    tables = []
+    for file_path, table in zip(csv_files, loaded):
+        if table is not None:
+            # The index comes from pd.to_datetime(errors='coerce'), so unparseable
+            # Date/Time values show up as nulls
+            nat_count = table.column('Datetime').null_count
             if nat_count > 0:
                 print(f"{file_path} has {nat_count} NaT rows")
 
-            bad_index_values = []
-            for idx in df.index:
-                try:
-                    pd.to_datetime(idx, errors='raise')
-                except:
-                    bad_index_values.append(idx)
-
-            if bad_index_values:
-                print(f"\n⚠️  Bad index values in {file_path}:")
-                for v in bad_index_values[:20]:
-                    print(f"   {repr(v)}")
-                if len(bad_index_values) > 20:
-                    print(f"   ... and {len(bad_index_values)-20} more")
-
-            all_data.append(df)
+            tables.append(table)
 
-    if all_data:
-        combined_df = pd.concat(all_data, ignore_index=False)
+    if tables:
+        try:
+            # Concatenating tables only chains their chunks; the single conversion
+            # then frees each Arrow column as soon as it is moved to pandas
+            combined = pa.concat_tables(tables, promote_options='permissive')
+            combined_df = combined.to_pandas(split_blocks=True, self_destruct=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            # A column has incompatible types across files; let pandas reconcile them
+            combined_df = pd.concat([table.to_pandas() for table in tables], ignore_index=False)
+        del tables
         print(f"Total records loaded before fixing index: {len(combined_df)}")
         return combined_df
 
@@ -162,25 +247,12 @@ def get_tour_columns(df, tour):
     Returns:
         List of column names for the specified tour
     """
-    columns = df.columns.tolist()
-    
-    if tour.upper() == 'A':
-        # Tour A main meter and climate
-        prefixes = ['TOUR_A_(TGBT_D14)', 'CLIM_TOUR_A_(TGBT_D6)']
-    elif tour.upper() == 'B':
-        # Tour B main meter, heat pump, and room meters
-        prefixes = ['Tour_B_(TGBT_D5)', 'SALLE_B101', 'SALLE_B112', 'SALLE_B201']
-    else:
+    prefixes = _TOUR_PREFIXES.get(tour.upper())
+    if prefixes is None:
         return []
     
-    tour_cols = []
-    for col in columns:
-        for prefix in prefixes:
-            if col.startswith(prefix):
-                tour_cols.append(col)
-                break
-    
-    return tour_cols
+    # One vectorized prefix test over the whole column Index
+    return df.columns[df.columns.astype(str).str.startswith(prefixes)].tolist()
 
 
 def extract_tour_data(df, tour):
@@ -219,33 +291,27 @@ def get_key_metrics_columns(df, tour):
     
     for col in tour_cols:
         col_lower = col.lower()
-        # Check for main power metrics
-        if 'kw sys' in col_lower and 'avg' in col_lower and 'kvar' not in col_lower:
-            # Prioritize main meter (D14 for Tour A, D5 for Tour B)
-            if 'tgbt_d14' in col_lower or 'tgbt_d5' in col_lower:
-                power_priority.insert(0, col)
-            else:
-                power_priority.append(col)
-        elif 'kwh' in col_lower and 'abs' in col_lower:
-            if 'tgbt_d14' in col_lower or 'tgbt_d5' in col_lower:
-                energy_priority.insert(0, col)
-            else:
-                energy_priority.append(col)
-        elif 'kvar sys' in col_lower and 'avg' in col_lower:
-            if 'reactive_power' not in metrics:
-                metrics['reactive_power'] = col
-        elif 'pf sys' in col_lower and 'avg' in col_lower:
-            if 'power_factor' not in metrics:
-                metrics['power_factor'] = col
-        elif 'a l1' in col_lower and 'avg' in col_lower:
-            if 'current_l1' not in metrics:
-                metrics['current_l1'] = col
-        elif 'a l2' in col_lower and 'avg' in col_lower:
-            if 'current_l2' not in metrics:
-                metrics['current_l2'] = col
-        elif 'a l3' in col_lower and 'avg' in col_lower:
-            if 'current_l3' not in metrics:
-                metrics['current_l3'] = col
+        # Most columns carry none of the metric keywords and are skipped after one regex scan
+        kinds = set(_METRIC_KIND_RE.findall(col_lower))
+        if not kinds:
+            continue
+        # Main meter (D14 for Tour A, D5 for Tour B)
+        is_main = 'tgbt_d14' in col_lower or 'tgbt_d5' in col_lower
+        for kind, aggregation, slot in _METRIC_RULES:
+            if kind not in kinds or aggregation not in col_lower:
+                continue
+            if slot == 'power_avg' and 'kvar' in col_lower:
+                continue
+            if slot in ('power_avg', 'energy'):
+                priority = power_priority if slot == 'power_avg' else energy_priority
+                # Prioritize main meter
+                if is_main:
+                    priority.insert(0, col)
+                else:
+                    priority.append(col)
+            elif slot not in metrics:
+                metrics[slot] = col
+            break
     
     # Select best power and energy columns
     if power_priority:
@@ -270,16 +336,47 @@ def clean_numeric_data(df):
     Returns:
         Cleaned DataFrame with numeric columns
     """
-    df_clean = df.copy()
+    # Coercion already turns '---' and empty strings into NaN, so the frame is
+    # converted in one pass without replacing them first
+    df_clean = df.apply(pd.to_numeric, errors='coerce')
+    
+    # Readings fit comfortably in float32, which halves the memory the analysis
+    # streams through. Cumulative energy counters (kWh) keep float64 precision.
+    float_cols = df_clean.select_dtypes('float64').columns
+    float_cols = float_cols[~float_cols.str.contains('kwh', case=False, regex=False)]
+    return df_clean.astype(dict.fromkeys(float_cols, np.float32))
+
+
+def interpolate_limited(values, positions, limit):
+    """
+    Linearly interpolate the NaNs of an array over the given positions.
     
-    for col in df_clean.columns:
-        # Replace '---' and empty strings with NaN
-        df_clean[col] = df_clean[col].replace(['---', '', ' '], np.nan)
+    Only the first `limit` NaNs after each valid value are filled, and
+    leading NaNs are kept, matching pandas' interpolate(limit=limit) with
+    its default forward direction.
+    
+    Args:
+        values: Float array with missing values
+        positions: Position of each value (e.g. int64 timestamps)
+        limit: Maximum number of consecutive NaNs to fill
         
-        # Convert to numeric
-        df_clean[col] = pd.to_numeric(df_clean[col], errors='coerce')
+    Returns:
+        Interpolated copy of values
+    """
+    missing = np.isnan(values)
+    valid = ~missing
+    if not valid.any():
+        return values
     
-    return df_clean
+    filled = values.copy()
+    order = np.argsort(positions[valid])
+    filled[missing] = np.interp(positions[missing], positions[valid][order], values[valid][order])
+    
+    # Distance of each value from the last valid value before it (-1 if there is none)
+    index = np.arange(len(values))
+    last_valid = np.maximum.accumulate(np.where(valid, index, -1))
+    filled[missing & ((last_valid < 0) | (index - last_valid > limit))] = np.nan
+    return filled
 
 
 def handle_missing_values(df, method='interpolate'):
@@ -297,11 +394,16 @@ def handle_missing_values(df, method='interpolate'):
     df_clean = df[df.index.notna()].copy()
     
     if method == 'interpolate':
-        try:
-            return df_clean.interpolate(method='time', limit=4)  # Limit to 1 hour (4 x 15min)
-        except Exception:
-            # Fallback to linear interpolation if time method fails
-            return df_clean.interpolate(method='linear', limit=4)
+        # Interpolate over time, or over positions if the index is not a DatetimeIndex
+        if isinstance(df_clean.index, pd.DatetimeIndex):
+            positions = df_clean.index.asi8
+        else:
+            positions = np.arange(len(df_clean))
+        for col in df_clean.columns:
+            values = df_clean[col].to_numpy()
+            if values.dtype.kind == 'f' and np.isnan(values).any():
+                df_clean[col] = interpolate_limited(values, positions, limit=4)  # Limit to 1 hour (4 x 15min)
+        return df_clean
     elif method == 'ffill':
         return df_clean.ffill(limit=4)
     elif method == 'drop':
@@ -320,13 +422,18 @@ def get_data_quality_report(df):
     Returns:
         Dictionary with data quality metrics
     """
+    # Build the missing-value mask once and derive every metric from it
+    missing = df.isna().to_numpy()
+    col_missing = missing.sum(axis=0)
+    total_missing = int(col_missing.sum())
+    
     report = {
         'total_records': len(df),
         'columns': len(df.columns),
-        'missing_values': df.isnull().sum().sum(),
-        'missing_percentage': (df.isnull().sum().sum() / (len(df) * len(df.columns))) * 100,
+        'missing_values': total_missing,
+        'missing_percentage': (total_missing / missing.size) * 100 if missing.size > 0 else 0,
         'date_range': f"{df.index.min()} to {df.index.max()}" if len(df) > 0 else "N/A",
-        'columns_with_missing': df.isnull().any().sum()
+        'columns_with_missing': int((col_missing > 0).sum())
     }
     return report
 
@@ -354,7 +461,7 @@ def check_data_availability(df, tour, metrics):
     
     if 'power_avg' in metrics:
         power_col = metrics['power_avg']
-        power_data = pd.to_numeric(df[power_col], errors='coerce')
+        power_data = df[power_col]
         non_null_count = power_data.notna().sum()
         availability['power_data_count'] = non_null_count
         availability['power_data_pct'] = (non_null_count / len(df)) * 100 if len(df) > 0 else 0
@@ -379,6 +486,89 @@ def check_data_availability(df, tour, metrics):
 # 4. EXPLORATORY DATA ANALYSIS
 # ============================================================================
 
+def group_sums_counts(values, codes, size):
+    """
+    Sum and count the valid values per integer code, ignoring NaNs.
+    
+    Args:
+        values: Float array of values
+        codes: Integer array of group codes in [0, size)
+        size: Number of groups
+        
+    Returns:
+        Tuple of (sums, counts) arrays of length size
+    """
+    valid = ~np.isnan(values)
+    sums = np.bincount(codes[valid], weights=values[valid], minlength=size)
+    counts = np.bincount(codes[valid], minlength=size)
+    return sums, counts
+
+
+def group_means(values, codes, size):
+    """
+    Mean of the values per integer code in one bincount pass instead of a pandas groupby.
+    
+    Args:
+        values: Float array of values
+        codes: Integer array of group codes in [0, size)
+        size: Number of groups
+        
+    Returns:
+        Array of length size with the mean per group (NaN for empty groups)
+    """
+    sums, counts = group_sums_counts(values, codes, size)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return sums / counts
+
+
+def get_time_parts(df):
+    """
+    Extract the hour and day of week of every row once, as plain arrays.
+    
+    Args:
+        df: DataFrame with datetime index
+        
+    Returns:
+        Dictionary with the 'hour' and 'day_of_week' arrays
+    """
+    return {
+        'hour': df.index.hour.to_numpy(),
+        'day_of_week': df.index.dayofweek.to_numpy()
+    }
+
+
+def aggregate_power(df, metrics, time_parts=None):
+    """
+    Compute the daily, hourly and day-of-week aggregates of the main power column once.
+    
+    Args:
+        df: DataFrame with tour data
+        metrics: Dictionary of key metric columns
+        time_parts: Hour and day of week arrays from get_time_parts (computed if None)
+        
+    Returns:
+        Dictionary with the daily means ('daily'), the 24 hourly means ('hourly')
+        and the per-weekday sums and counts ('dow_sums', 'dow_counts'), or None
+        if there is no power column
+    """
+    if 'power_avg' not in metrics:
+        return None
+    
+    if time_parts is None:
+        time_parts = get_time_parts(df)
+    
+    power = df[metrics['power_avg']]
+    values = power.to_numpy(dtype=np.float64)
+    dow_sums, dow_counts = group_sums_counts(values, time_parts['day_of_week'], 7)
+    
+    return {
+        'daily': power.resample('D').mean(),
+        'hourly': group_means(values, time_parts['hour'], 24),
+        'dow_sums': dow_sums,
+        'dow_counts': dow_counts
+    }
+
+
 def calculate_summary_statistics(df, tour_name):
     """
     Calculate summary statistics for power consumption.
@@ -393,9 +583,16 @@ def calculate_summary_statistics(df, tour_name):
     # Get only numeric columns
     numeric_df = df.select_dtypes(include=[np.number])
     
-    stats = numeric_df.describe().T
-    stats['missing_count'] = numeric_df.isnull().sum()
-    stats['missing_pct'] = (numeric_df.isnull().sum() / len(numeric_df)) * 100
+    n_rows = len(numeric_df)
+    
+    # Same columns as describe(), with the missing counts derived from 'count'
+    # instead of a separate isnull() pass
+    stats = numeric_df.agg(['count', 'mean', 'std', 'min', 'max']).T
+    quantiles = numeric_df.quantile([0.25, 0.5, 0.75]).T
+    quantiles.columns = ['25%', '50%', '75%']
+    stats = stats.join(quantiles)[['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max']]
+    stats['missing_count'] = (n_rows - stats['count']).astype(np.int64)
+    stats['missing_pct'] = (stats['missing_count'] / n_rows) * 100
     
     return stats
 
@@ -416,7 +613,7 @@ def analyze_power_consumption(df, metrics, tour_name):
     
     if 'power_avg' in metrics:
         power_col = metrics['power_avg']
-        power_data = pd.to_numeric(df[power_col], errors='coerce')
+        power_data = df[power_col]
         
         results['avg_power_kw'] = power_data.mean()
         results['max_power_kw'] = power_data.max()
@@ -426,44 +623,57 @@ def analyze_power_consumption(df, metrics, tour_name):
         # Calculate total energy if available
         if 'energy' in metrics:
             energy_col = metrics['energy']
-            energy_data = pd.to_numeric(df[energy_col], errors='coerce')
+            energy_data = df[energy_col].to_numpy(dtype=np.float64)
             if len(energy_data) > 0:
-                results['total_energy_kwh'] = energy_data.iloc[-1] - energy_data.iloc[0]
+                # Difference between the first and last valid counter readings;
+                # the raw endpoints are often missing
+                valid = np.flatnonzero(~np.isnan(energy_data))
+                if len(valid) > 0:
+                    results['total_energy_kwh'] = energy_data[valid[-1]] - energy_data[valid[0]]
+                else:
+                    results['total_energy_kwh'] = np.nan
     
     if 'power_factor' in metrics:
         pf_col = metrics['power_factor']
-        pf_data = pd.to_numeric(df[pf_col], errors='coerce')
+        pf_data = df[pf_col]
         results['avg_power_factor'] = pf_data.mean()
     
     return results
 
 
-def analyze_temporal_patterns(df, power_col):
+def analyze_temporal_patterns(df, power_col, time_parts=None):
     """
     Analyze temporal patterns in power consumption.
     
     Args:
         df: DataFrame with datetime index
         power_col: Column name for power data
+        time_parts: Hour and day of week arrays from get_time_parts (computed if None)
         
     Returns:
         Dictionary with temporal analysis results
     """
-    power_data = pd.to_numeric(df[power_col], errors='coerce')
-    
-    # Add time components
-    analysis_df = pd.DataFrame({
-        'power': power_data,
-        'hour': df.index.hour,
-        'day_of_week': df.index.dayofweek,
-        'is_weekend': df.index.dayofweek >= 5
-    })
+    if time_parts is None:
+        time_parts = get_time_parts(df)
+    
+    power = df[power_col].to_numpy(dtype=np.float64)
+    hour = time_parts['hour']
+    day_of_week = time_parts['day_of_week']
+    is_weekend = day_of_week >= 5
+    
+    # Aggregate straight on the numpy arrays; like groupby, only hours and
+    # days that have rows get an entry (NaN if none of their readings is valid)
+    hourly_avg = group_means(power, hour, 24)
+    daily_avg = group_means(power, day_of_week, 7)
+    weekday_sums, weekday_counts = group_sums_counts(power, is_weekend.astype(np.intp), 2)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        weekday_means = weekday_sums / weekday_counts
     
     results = {
-        'hourly_avg': analysis_df.groupby('hour')['power'].mean().to_dict(),
-        'daily_avg': analysis_df.groupby('day_of_week')['power'].mean().to_dict(),
-        'weekday_avg': analysis_df[~analysis_df['is_weekend']]['power'].mean(),
-        'weekend_avg': analysis_df[analysis_df['is_weekend']]['power'].mean()
+        'hourly_avg': {int(h): hourly_avg[h] for h in np.flatnonzero(np.bincount(hour, minlength=24))},
+        'daily_avg': {int(d): daily_avg[d] for d in np.flatnonzero(np.bincount(day_of_week, minlength=7))},
+        'weekday_avg': weekday_means[0],
+        'weekend_avg': weekday_means[1]
     }
     
     return results
@@ -473,7 +683,35 @@ def analyze_temporal_patterns(df, power_col):
 # 5. VISUALIZATIONS
 # ============================================================================
 
-def plot_power_comparison_timeseries(df_a, df_b, metrics_a, metrics_b, save_path=None):
+def decimate_positions(values, target=5000):
+    """
+    Pick the positions of a series to plot, keeping its peaks.
+    
+    The values are split into target / 2 buckets and the minimum and maximum of
+    each bucket are kept, so spikes stay visible in the decimated line.
+    
+    Args:
+        values: Float array of values to plot
+        target: Maximum number of points to keep
+        
+    Returns:
+        Sorted array of positions into values
+    """
+    n = len(values)
+    if n <= target:
+        return np.arange(n)
+    
+    step = -(-n // (target // 2))
+    padded = np.full(-(-n // step) * step, np.nan)
+    padded[:n] = values
+    buckets = padded.reshape(-1, step)
+    starts = np.arange(len(buckets)) * step
+    lows = starts + np.where(np.isnan(buckets), np.inf, buckets).argmin(axis=1)
+    highs = starts + np.where(np.isnan(buckets), -np.inf, buckets).argmax(axis=1)
+    return np.unique(np.minimum(np.concatenate([lows, highs]), n - 1))
+
+
+def plot_power_comparison_timeseries(df_a, df_b, metrics_a, metrics_b, aggregates_a, aggregates_b, save_path=None):
     """
     Plot time series comparison of power consumption.
     """
@@ -481,11 +719,14 @@ def plot_power_comparison_timeseries(df_a, df_b, metrics_a, metrics_b, save_path
     
     # Power consumption over time
     if 'power_avg' in metrics_a and 'power_avg' in metrics_b:
-        power_a = pd.to_numeric(df_a[metrics_a['power_avg']], errors='coerce')
-        power_b = pd.to_numeric(df_b[metrics_b['power_avg']], errors='coerce')
+        power_a = df_a[metrics_a['power_avg']]
+        power_b = df_b[metrics_b['power_avg']]
         
-        axes[0].plot(df_a.index, power_a, label='Tour A', alpha=0.7, linewidth=0.5)
-        axes[0].plot(df_b.index, power_b, label='Tour B', alpha=0.7, linewidth=0.5)
+        # Decimate first: the figure cannot show more points than it has pixels
+        keep_a = decimate_positions(power_a.to_numpy(dtype=np.float64))
+        keep_b = decimate_positions(power_b.to_numpy(dtype=np.float64))
+        axes[0].plot(df_a.index[keep_a], power_a.iloc[keep_a], label='Tour A', alpha=0.7, linewidth=0.5)
+        axes[0].plot(df_b.index[keep_b], power_b.iloc[keep_b], label='Tour B', alpha=0.7, linewidth=0.5)
         axes[0].set_xlabel('Date')
         axes[0].set_ylabel('Power (kW)')
         axes[0].set_title('Power Consumption Over Time - Tour A vs Tour B')
@@ -493,12 +734,9 @@ def plot_power_comparison_timeseries(df_a, df_b, metrics_a, metrics_b, save_path
         axes[0].grid(True, alpha=0.3)
     
     # Daily average comparison
-    if 'power_avg' in metrics_a and 'power_avg' in metrics_b:
-        power_a = pd.to_numeric(df_a[metrics_a['power_avg']], errors='coerce')
-        power_b = pd.to_numeric(df_b[metrics_b['power_avg']], errors='coerce')
-        
-        daily_a = power_a.resample('D').mean()
-        daily_b = power_b.resample('D').mean()
+    if aggregates_a is not None and aggregates_b is not None:
+        daily_a = aggregates_a['daily']
+        daily_b = aggregates_b['daily']
         
         axes[1].bar(daily_a.index, daily_a.values, alpha=0.6, label='Tour A', width=0.4)
         axes[1].bar(daily_b.index, daily_b.values, alpha=0.6, label='Tour B', width=0.4)
@@ -515,25 +753,22 @@ def plot_power_comparison_timeseries(df_a, df_b, metrics_a, metrics_b, save_path
     plt.close()
 
 
-def plot_hourly_patterns(df_a, df_b, metrics_a, metrics_b, save_path=None):
+def plot_hourly_patterns(aggregates_a, aggregates_b, save_path=None):
     """
-    Plot hourly consumption patterns.
+    Plot hourly consumption patterns from the precomputed power aggregates.
     """
     fig, axes = plt.subplots(1, 2, figsize=(14, 5))
     
-    if 'power_avg' in metrics_a and 'power_avg' in metrics_b:
-        power_a = pd.to_numeric(df_a[metrics_a['power_avg']], errors='coerce')
-        power_b = pd.to_numeric(df_b[metrics_b['power_avg']], errors='coerce')
-        
-        hourly_a = power_a.groupby(df_a.index.hour).mean()
-        hourly_b = power_b.groupby(df_b.index.hour).mean()
+    if aggregates_a is not None and aggregates_b is not None:
+        hourly_a = aggregates_a['hourly']
+        hourly_b = aggregates_b['hourly']
         
         # Bar chart
         x = np.arange(24)
         width = 0.35
         
-        axes[0].bar(x - width/2, hourly_a.values, width, label='Tour A', alpha=0.8)
-        axes[0].bar(x + width/2, hourly_b.values, width, label='Tour B', alpha=0.8)
+        axes[0].bar(x - width/2, hourly_a, width, label='Tour A', alpha=0.8)
+        axes[0].bar(x + width/2, hourly_b, width, label='Tour B', alpha=0.8)
         axes[0].set_xlabel('Hour of Day')
         axes[0].set_ylabel('Average Power (kW)')
         axes[0].set_title('Hourly Power Consumption Pattern')
@@ -542,7 +777,7 @@ def plot_hourly_patterns(df_a, df_b, metrics_a, metrics_b, save_path=None):
         axes[0].grid(True, alpha=0.3)
         
         # Difference plot
-        diff = hourly_b.values - hourly_a.values
+        diff = hourly_b - hourly_a
         colors = ['green' if d > 0 else 'red' for d in diff]
         axes[1].bar(x, diff, color=colors, alpha=0.7)
         axes[1].axhline(y=0, color='black', linestyle='-', linewidth=0.5)
@@ -566,8 +801,8 @@ def plot_distribution_comparison(df_a, df_b, metrics_a, metrics_b, save_path=Non
     fig, axes = plt.subplots(1, 2, figsize=(14, 5))
     
     if 'power_avg' in metrics_a and 'power_avg' in metrics_b:
-        power_a = pd.to_numeric(df_a[metrics_a['power_avg']], errors='coerce').dropna()
-        power_b = pd.to_numeric(df_b[metrics_b['power_avg']], errors='coerce').dropna()
+        power_a = df_a[metrics_a['power_avg']].dropna()
+        power_b = df_b[metrics_b['power_avg']].dropna()
         
         # Histogram
         axes[0].hist(power_a, bins=50, alpha=0.6, label='Tour A', density=True)
@@ -596,27 +831,32 @@ def plot_distribution_comparison(df_a, df_b, metrics_a, metrics_b, save_path=Non
     plt.close()
 
 
-def plot_weekly_patterns(df_a, df_b, metrics_a, metrics_b, save_path=None):
+def plot_weekly_patterns(aggregates_a, aggregates_b, save_path=None):
     """
-    Plot weekly consumption patterns.
+    Plot weekly consumption patterns from the precomputed power aggregates.
     """
     fig, axes = plt.subplots(1, 2, figsize=(14, 5))
     
     days = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
     
-    if 'power_avg' in metrics_a and 'power_avg' in metrics_b:
-        power_a = pd.to_numeric(df_a[metrics_a['power_avg']], errors='coerce')
-        power_b = pd.to_numeric(df_b[metrics_b['power_avg']], errors='coerce')
-        
-        weekly_a = power_a.groupby(df_a.index.dayofweek).mean()
-        weekly_b = power_b.groupby(df_b.index.dayofweek).mean()
+    if aggregates_a is not None and aggregates_b is not None:
+        # Per-day sums and counts also give the weekday/weekend means below
+        sums_a, counts_a = aggregates_a['dow_sums'], aggregates_a['dow_counts']
+        sums_b, counts_b = aggregates_b['dow_sums'], aggregates_b['dow_counts']
+        with np.errstate(invalid='ignore', divide='ignore'):
+            weekly_a = sums_a / counts_a
+            weekly_b = sums_b / counts_b
+            weekday_a = sums_a[:5].sum() / counts_a[:5].sum()
+            weekend_a = sums_a[5:].sum() / counts_a[5:].sum()
+            weekday_b = sums_b[:5].sum() / counts_b[:5].sum()
+            weekend_b = sums_b[5:].sum() / counts_b[5:].sum()
         
         # Bar chart
         x = np.arange(7)
         width = 0.35
         
-        axes[0].bar(x - width/2, weekly_a.values, width, label='Tour A', alpha=0.8)
-        axes[0].bar(x + width/2, weekly_b.values, width, label='Tour B', alpha=0.8)
+        axes[0].bar(x - width/2, weekly_a, width, label='Tour A', alpha=0.8)
+        axes[0].bar(x + width/2, weekly_b, width, label='Tour B', alpha=0.8)
         axes[0].set_xlabel('Day of Week')
         axes[0].set_ylabel('Average Power (kW)')
         axes[0].set_title('Weekly Power Consumption Pattern')
@@ -626,11 +866,6 @@ def plot_weekly_patterns(df_a, df_b, metrics_a, metrics_b, save_path=None):
         axes[0].grid(True, alpha=0.3)
         
         # Weekday vs Weekend
-        weekday_a = power_a[df_a.index.dayofweek < 5].mean()
-        weekend_a = power_a[df_a.index.dayofweek >= 5].mean()
-        weekday_b = power_b[df_b.index.dayofweek < 5].mean()
-        weekend_b = power_b[df_b.index.dayofweek >= 5].mean()
-        
         x = np.arange(2)
         width = 0.35
         
@@ -705,8 +940,9 @@ def plot_cumulative_energy(df_a, df_b, metrics_a, metrics_b, save_path=None):
     fig, ax = plt.subplots(figsize=(12, 6))
     
     if 'power_avg' in metrics_a and 'power_avg' in metrics_b:
-        power_a = pd.to_numeric(df_a[metrics_a['power_avg']], errors='coerce').fillna(0)
-        power_b = pd.to_numeric(df_b[metrics_b['power_avg']], errors='coerce').fillna(0)
+        # Accumulate in float64 so the running total does not drift
+        power_a = df_a[metrics_a['power_avg']].fillna(0).astype(np.float64)
+        power_b = df_b[metrics_b['power_avg']].fillna(0).astype(np.float64)
         
         # Convert to kWh (power * time interval in hours)
         # Assuming 15-minute intervals = 0.25 hours
@@ -801,18 +1037,21 @@ def generate_insights(results_a, results_b, temporal_a, temporal_b, availability
     # Power factor comparison
     pf_a = results_a.get('avg_power_factor', None)
     pf_b = results_b.get('avg_power_factor', None)
+    # Checked once per tour; NaN is the only value not equal to itself
+    has_pf_a = pf_a is not None and pf_a == pf_a
+    has_pf_b = pf_b is not None and pf_b == pf_b
     
     insights.append(f"\n3. POWER FACTOR (EFFICIENCY INDICATOR):")
-    if pf_a is not None and pd.notna(pf_a):
+    if has_pf_a:
         insights.append(f"   - Tour A: {pf_a:.3f}")
     else:
         insights.append(f"   - Tour A: Not available")
-    if pf_b is not None and pd.notna(pf_b):
+    if has_pf_b:
         insights.append(f"   - Tour B: {pf_b:.3f}")
     else:
         insights.append(f"   - Tour B: Not available")
     
-    if pf_a and pf_b and pd.notna(pf_a) and pd.notna(pf_b):
+    if has_pf_a and has_pf_b and pf_a and pf_b:
         insights.append(f"   - {'Tour A' if abs(pf_a) > abs(pf_b) else 'Tour B'} has better power factor")
     
     # Weekday vs Weekend patterns
@@ -822,12 +1061,14 @@ def generate_insights(results_a, results_b, temporal_a, temporal_b, availability
         insights.append(f"      - Weekday avg: {temporal_a.get('weekday_avg', 0):.2f} kW")
         insights.append(f"      - Weekend avg: {temporal_a.get('weekend_avg', 0):.2f} kW")
     if temporal_b:
+        weekday_b = temporal_b.get('weekday_avg', 0)
+        weekend_b = temporal_b.get('weekend_avg', 0)
         insights.append(f"   Tour B:")
-        insights.append(f"      - Weekday avg: {temporal_b.get('weekday_avg', 0):.2f} kW")
-        insights.append(f"      - Weekend avg: {temporal_b.get('weekend_avg', 0):.2f} kW")
+        insights.append(f"      - Weekday avg: {weekday_b:.2f} kW")
+        insights.append(f"      - Weekend avg: {weekend_b:.2f} kW")
         
-        if temporal_b.get('weekday_avg', 0) > 0 and temporal_b.get('weekend_avg', 0) > 0:
-            wkday_vs_wknd = ((temporal_b['weekday_avg'] - temporal_b['weekend_avg']) / temporal_b['weekend_avg']) * 100
+        if weekday_b > 0 and weekend_b > 0:
+            wkday_vs_wknd = ((weekday_b - weekend_b) / weekend_b) * 100
             insights.append(f"      - Tour B weekday consumption is {abs(wkday_vs_wknd):.1f}% {'higher' if wkday_vs_wknd > 0 else 'lower'} than weekend")
     
     # Energy efficiency summary
@@ -978,28 +1219,36 @@ def main():
     print(f"  Tour A - Avg: {results_a.get('avg_power_kw', 'N/A'):.2f} kW, Max: {results_a.get('max_power_kw', 'N/A'):.2f} kW")
     print(f"  Tour B - Avg: {results_b.get('avg_power_kw', 'N/A'):.2f} kW, Max: {results_b.get('max_power_kw', 'N/A'):.2f} kW")
     
+    # Hour and day of week of every row, shared by the temporal analysis and the plots
+    time_parts_a = get_time_parts(df_tour_a)
+    time_parts_b = get_time_parts(df_tour_b)
+    
     # Temporal patterns
     temporal_a = None
     temporal_b = None
     if 'power_avg' in metrics_a:
-        temporal_a = analyze_temporal_patterns(df_tour_a, metrics_a['power_avg'])
+        temporal_a = analyze_temporal_patterns(df_tour_a, metrics_a['power_avg'], time_parts_a)
     if 'power_avg' in metrics_b:
-        temporal_b = analyze_temporal_patterns(df_tour_b, metrics_b['power_avg'])
+        temporal_b = analyze_temporal_patterns(df_tour_b, metrics_b['power_avg'], time_parts_b)
     
     # =========================================
     # Step 5: Generate visualizations
     # =========================================
     print("\n[5/6] Generating visualizations...")
     
+    # Daily, hourly and day-of-week aggregates shared by the plots
+    aggregates_a = aggregate_power(df_tour_a, metrics_a, time_parts_a)
+    aggregates_b = aggregate_power(df_tour_b, metrics_b, time_parts_b)
+    
     # Time series comparison
     plot_power_comparison_timeseries(
-        df_tour_a, df_tour_b, metrics_a, metrics_b,
+        df_tour_a, df_tour_b, metrics_a, metrics_b, aggregates_a, aggregates_b,
         save_path=os.path.join(output_dir, "01_power_timeseries.png")
     )
     
     # Hourly patterns
     plot_hourly_patterns(
-        df_tour_a, df_tour_b, metrics_a, metrics_b,
+        aggregates_a, aggregates_b,
         save_path=os.path.join(output_dir, "02_hourly_patterns.png")
     )
     
@@ -1011,7 +1260,7 @@ def main():
     
     # Weekly patterns
     plot_weekly_patterns(
-        df_tour_a, df_tour_b, metrics_a, metrics_b,
+        aggregates_a, aggregates_b,
         save_path=os.path.join(output_dir, "04_weekly_patterns.png")
     )
     
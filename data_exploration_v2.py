@@ -16,10 +16,15 @@ import re
 import json
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import matplotlib
+matplotlib.use('Agg')  # Figures are only saved to files; no GUI backend needed
 import matplotlib.pyplot as plt
 import seaborn as sns
 import warnings
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
 
 warnings.filterwarnings('ignore')
 
@@ -27,6 +32,15 @@ warnings.filterwarnings('ignore')
 plt.style.use('seaborn-v0_8-whitegrid')
 sns.set_palette("husl")
 
+# Placeholders the meters write for missing readings
+NULL_VALUES = ['---', '', ' ']
+
+# Column name prefixes of each tour's meters, compiled into one anchored alternation per tour
+TOUR_COLUMN_PATTERNS = {
+    'A': re.compile(r'(?:TOUR_A_\(TGBT_D14\)|CLIM_TOUR_A_\(TGBT_D6\))'),
+    'B': re.compile(r'(?:Tour_B_\(TGBT_D5\)|SALLE_B101|SALLE_B112|SALLE_B201)'),
+}
+
 
 # ============================================================================
 # 1. DATA LOADING FUNCTIONS (with column name normalization)
@@ -52,15 +66,35 @@ def get_csv_files(data_dir):
     return sorted(csv_files)
 
 
+def read_csv_file(file_path):
+    """Read a semicolon-separated CSV file with the multithreaded PyArrow parser, falling back to pandas."""
+    try:
+        table = pacsv.read_csv(
+            file_path,
+            read_options=pacsv.ReadOptions(use_threads=True, block_size=8 << 20),
+            parse_options=pacsv.ParseOptions(delimiter=';'),
+            convert_options=pacsv.ConvertOptions(
+                # Date/Time stay text for the Datetime parsing below
+                column_types={'Date': pa.string(), 'Time': pa.string()},
+                null_values=NULL_VALUES,
+                strings_can_be_null=True
+            )
+        )
+    except pa.ArrowInvalid:
+        return pd.read_csv(file_path, sep=';', low_memory=False)
+    return table.to_pandas(split_blocks=True, self_destruct=True)
+
+
 def load_single_file(file_path):
     """Load a single CSV/XLSX file with proper parsing."""
     try:
         if file_path.endswith('.csv'):
-            df = pd.read_csv(file_path, sep=';', low_memory=False)
+            df = read_csv_file(file_path)
         elif file_path.endswith('.xlsx'):
             df = pd.read_excel(file_path)
+            # Date is read as yyyy-mm-dd hh:mm:ss; keep only the day
             if 'Date' in df.columns:
-                df['Date'] = pd.to_datetime(df['Date']).dt.strftime('%d-%m-%Y')
+                df['Date'] = pd.to_datetime(df['Date']).dt.normalize()
             df.columns = [normalize_column_name(col) for col in df.columns]
         else:
             return None
@@ -68,13 +102,12 @@ def load_single_file(file_path):
         if 'Date' in df.columns and 'Time' in df.columns:
             mask = ~(df['Time'] == '24:00:00')
             df = df[mask]
-            df['Datetime'] = pd.to_datetime(
-                df['Date'] + ' ' + df['Time'], 
-                format='%d-%m-%Y %H:%M:%S',
-                errors='coerce'
-            )
-            df.set_index('Datetime', inplace=True)
-            df.drop(['Date', 'Time'], axis=1, inplace=True)
+            # Parse dates (cached, they repeat 96 times a day) and times separately and
+            # add them as datetime64/timedelta64 instead of parsing concatenated strings
+            dates = pd.to_datetime(df['Date'], format='%d-%m-%Y', cache=True, errors='coerce')
+            times = pd.to_timedelta(df['Time'].astype(str), errors='coerce')
+            df = df.drop(['Date', 'Time'], axis=1)
+            df.index = pd.DatetimeIndex(dates.to_numpy() + times.to_numpy(), name='Datetime')
         return df
     except Exception as e:
         print(f"Error loading {file_path}: {e}")
@@ -86,16 +119,20 @@ def load_all_data(data_dir):
     csv_files = get_csv_files(data_dir)
     print(f"Found {len(csv_files)} files")
     
-    all_data = []
-    for file_path in csv_files:
-        df = load_single_file(file_path)
-        if df is not None:
-            all_data.append(df)
+    # Files are parsed independently, so spread them over worker processes
+    with ProcessPoolExecutor() as executor:
+        all_data = [df for df in executor.map(load_single_file, csv_files) if df is not None]
     
     if all_data:
-        combined_df = pd.concat(all_data, ignore_index=False)
-        combined_df = combined_df[combined_df.index.notna()]
-        combined_df = combined_df.sort_index()
+        # Align every file to the union of columns up front so concat only stacks blocks
+        columns = pd.Index(dict.fromkeys(col for df in all_data for col in df.columns))
+        all_data = [df if df.columns.equals(columns) else df.reindex(columns=columns) for df in all_data]
+        combined_df = pd.concat(all_data, copy=False)
+        del all_data
+        # Sorting puts the NaT rows last, so they are dropped with a slice instead of a mask copy
+        nat_count = combined_df.index.isna().sum()
+        combined_df.sort_index(inplace=True)
+        combined_df = combined_df.iloc[:len(combined_df) - nat_count]
         print(f"Total records loaded: {len(combined_df)}")
         return combined_df
     return None
@@ -107,22 +144,11 @@ def load_all_data(data_dir):
 
 def get_tour_columns(df, tour):
     """Extract columns related to a specific tour."""
-    columns = df.columns.tolist()
-    
-    if tour.upper() == 'A':
-        prefixes = ['TOUR_A_(TGBT_D14)', 'CLIM_TOUR_A_(TGBT_D6)']
-    elif tour.upper() == 'B':
-        prefixes = ['Tour_B_(TGBT_D5)', 'SALLE_B101', 'SALLE_B112', 'SALLE_B201']
-    else:
+    pattern = TOUR_COLUMN_PATTERNS.get(tour.upper())
+    if pattern is None:
         return []
-    
-    tour_cols = []
-    for col in columns:
-        for prefix in prefixes:
-            if col.startswith(prefix):
-                tour_cols.append(col)
-                break
-    return tour_cols
+    # match() anchors at the start of the name, like startswith
+    return [col for col in df.columns if pattern.match(col)]
 
 
 def get_power_column(df, tour):
@@ -139,39 +165,110 @@ def get_power_column(df, tour):
 
 def clean_power_data(df, power_col):
     """Clean power data by removing outliers and handling missing values."""
-    power = pd.to_numeric(df[power_col], errors='coerce')
+    # Work on one float64 copy of the column instead of a chain of Series temporaries
+    values = pd.to_numeric(df[power_col], errors='coerce').to_numpy(dtype=np.float64, copy=True)
     
     # Remove extreme outliers (> 3 standard deviations or above 50 kW for these buildings)
-    mean_power = power.mean()
-    std_power = power.std()
+    mean_power = np.nanmean(values)
+    std_power = np.nanstd(values, ddof=1)
     upper_limit = min(mean_power + 3 * std_power, 50)  # Cap at 50 kW
-    power = power.where(power <= upper_limit, np.nan)
+    values[~(values <= upper_limit)] = np.nan
     
-    return power
+    return pd.Series(values, index=df.index, name=power_col)
 
 
 # ============================================================================
 # 3. ENHANCED ANALYSIS FUNCTIONS
 # ============================================================================
 
+# Time keys per DatetimeIndex, keyed by id(index); the index is kept alongside
+# so its id cannot be reused while the entry exists
+_time_keys_cache = {}
+
+
+def get_time_keys(power_series):
+    """
+    Hour, day of week and month of every reading as int8 arrays.
+    
+    The arrays are computed once per index and cached, so the analysis and
+    export functions that group series sharing an index by time reuse them.
+    Indexes are immutable, so a series given a new index gets new keys.
+    """
+    index = power_series.index
+    cached = _time_keys_cache.get(id(index))
+    if cached is None or cached[0] is not index:
+        keys = {
+            'hour': index.hour.to_numpy().astype(np.int8),
+            'dow': index.dayofweek.to_numpy().astype(np.int8),
+            'month': index.month.to_numpy().astype(np.int8)
+        }
+        cached = _time_keys_cache[id(index)] = (index, keys)
+    return cached[1]
+
+
+def bin_stats(values, codes, size):
+    """
+    Count, mean, std, min and max of the values per integer code in [0, size).
+    
+    All five statistics come from bincount and ufunc.at passes over the same
+    arrays instead of one pandas reduction each. NaN values are ignored.
+    """
+    valid = ~np.isnan(values)
+    values, codes = values[valid], codes[valid]
+    
+    count = np.bincount(codes, minlength=size)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.bincount(codes, weights=values, minlength=size) / count
+        # Squared deviations from the bin mean, as pandas does, rather than sum of squares
+        sq_dev = np.bincount(codes, weights=(values - mean[codes]) ** 2, minlength=size)
+        std = np.sqrt(sq_dev / (count - 1))
+    std[count < 2] = np.nan
+    
+    low = np.full(size, np.inf)
+    high = np.full(size, -np.inf)
+    np.minimum.at(low, codes, values)
+    np.maximum.at(high, codes, values)
+    empty = count == 0
+    low[empty] = np.nan
+    high[empty] = np.nan
+    
+    return pd.DataFrame({'count': count, 'mean': mean, 'std': std, 'min': low, 'max': high})
+
+
 def calculate_monthly_stats(power_series, name):
     """Calculate monthly statistics."""
-    monthly = power_series.resample('M').agg(['mean', 'max', 'min', 'std', 'count'])
+    index = power_series.index
+    month_id = index.year.to_numpy() * 12 + get_time_keys(power_series)['month'] - 1
+    first = month_id.min()
+    size = month_id.max() - first + 1
+    
+    monthly = bin_stats(power_series.to_numpy(dtype=np.float64), month_id - first, size)
+    monthly = monthly[['mean', 'max', 'min', 'std', 'count']]
+    # Month-end labels, like resample('M')
+    monthly.index = pd.date_range(index.min(), periods=size, freq='M', name=index.name).normalize()
     monthly.columns = [f'{name}_{c}' for c in monthly.columns]
     return monthly
 
 
 def calculate_hourly_patterns(power_series):
     """Calculate hourly consumption patterns."""
-    hourly = power_series.groupby(power_series.index.hour).agg(['mean', 'std', 'max', 'min'])
+    hour = get_time_keys(power_series)['hour']
+    hourly = bin_stats(power_series.to_numpy(dtype=np.float64), hour, 24)
+    # Like groupby, keep only the hours that have rows
+    present = np.flatnonzero(np.bincount(hour, minlength=24))
+    hourly = hourly.loc[present, ['mean', 'std', 'max', 'min']]
+    hourly.index = pd.Index(present.astype(np.int32), name=power_series.index.name)
     return hourly
 
 
 def calculate_weekly_patterns(power_series):
     """Calculate weekly consumption patterns."""
     daily_names = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-    weekly = power_series.groupby(power_series.index.dayofweek).agg(['mean', 'std'])
-    weekly.index = daily_names
+    day_of_week = get_time_keys(power_series)['dow']
+    weekly = bin_stats(power_series.to_numpy(dtype=np.float64), day_of_week, 7)
+    present = np.flatnonzero(np.bincount(day_of_week, minlength=7))
+    weekly = weekly.loc[present, ['mean', 'std']]
+    weekly.index = [daily_names[day] for day in present]
     return weekly
 
 
@@ -205,14 +302,14 @@ def estimate_energy_consumption(power_series, interval_hours=0.25):
 
 def analyze_peak_hours(power_series, top_n=5):
     """Find peak consumption hours."""
-    hourly_avg = power_series.groupby(power_series.index.hour).mean()
+    hourly_avg = power_series.groupby(get_time_keys(power_series)['hour']).mean()
     peak_hours = hourly_avg.nlargest(top_n)
     return peak_hours
 
 
 def analyze_off_peak_hours(power_series, bottom_n=5):
     """Find off-peak consumption hours."""
-    hourly_avg = power_series.groupby(power_series.index.hour).mean()
+    hourly_avg = power_series.groupby(get_time_keys(power_series)['hour']).mean()
     off_peak_hours = hourly_avg.nsmallest(bottom_n)
     return off_peak_hours
 
@@ -223,8 +320,8 @@ def compare_seasonal_patterns(power_a, power_b):
     month_order = ['January', 'February', 'March', 'April', 'May', 'June',
                    'July', 'August', 'September', 'October', 'November', 'December']
     
-    a_monthly = power_a.groupby(power_a.index.month).mean()
-    b_monthly = power_b.groupby(power_b.index.month).mean()
+    a_monthly = power_a.groupby(get_time_keys(power_a)['month']).mean()
+    b_monthly = power_b.groupby(get_time_keys(power_b)['month']).mean()
     
     # Convert to month names
     a_monthly.index = [month_order[i-1] for i in a_monthly.index]
@@ -280,16 +377,31 @@ def plot_monthly_comparison(power_a, power_b, save_path=None):
     plt.close()
 
 
+def heatmap_matrix(power_series):
+    """Mean power per day of week (rows) and hour (columns) as a 7x24 DataFrame, NaN where empty."""
+    keys = get_time_keys(power_series)
+    # One bincount over the linearized day * 24 + hour cell instead of a pivot table
+    cells = keys['dow'].astype(np.intp) * 24 + keys['hour']
+    values = power_series.to_numpy(dtype=np.float64)
+    valid = ~np.isnan(values)
+    sums = np.bincount(cells[valid], weights=values[valid], minlength=7 * 24)
+    counts = np.bincount(cells[valid], minlength=7 * 24)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = sums / counts
+    return pd.DataFrame(
+        means.reshape(7, 24),
+        index=pd.RangeIndex(7, name='day'),
+        columns=pd.RangeIndex(24, name='hour')
+    )
+
+
 def plot_heatmap_comparison(power_a, power_b, save_path=None):
     """Plot hourly consumption heatmaps for both tours."""
     fig, axes = plt.subplots(1, 2, figsize=(16, 6))
     
-    # Create hour vs day of week pivot tables
-    df_a = pd.DataFrame({'power': power_a, 'hour': power_a.index.hour, 'day': power_a.index.dayofweek})
-    df_b = pd.DataFrame({'power': power_b, 'hour': power_b.index.hour, 'day': power_b.index.dayofweek})
-    
-    pivot_a = df_a.pivot_table(values='power', index='day', columns='hour', aggfunc='mean')
-    pivot_b = df_b.pivot_table(values='power', index='day', columns='hour', aggfunc='mean')
+    # Day of week x hour mean matrices
+    pivot_a = heatmap_matrix(power_a)
+    pivot_b = heatmap_matrix(power_b)
     
     days = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
     
@@ -464,8 +576,8 @@ def export_dashboard_data(power_a, power_b, metrics_a, metrics_b, output_path):
     ]
     
     # Hourly data
-    hourly_a = power_a.groupby(power_a.index.hour).mean()
-    hourly_b = power_b.groupby(power_b.index.hour).mean()
+    hourly_a = power_a.groupby(get_time_keys(power_a)['hour']).mean()
+    hourly_b = power_b.groupby(get_time_keys(power_b)['hour']).mean()
     hourly_data = []
     for hour in range(24):
         a_val = hourly_a.get(hour, 0) if not pd.isna(hourly_a.get(hour, 0)) else 0
@@ -479,8 +591,8 @@ def export_dashboard_data(power_a, power_b, metrics_a, metrics_b, output_path):
     
     # Weekly data
     days = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-    weekly_a = power_a.groupby(power_a.index.dayofweek).mean()
-    weekly_b = power_b.groupby(power_b.index.dayofweek).mean()
+    weekly_a = power_a.groupby(get_time_keys(power_a)['dow']).mean()
+    weekly_b = power_b.groupby(get_time_keys(power_b)['dow']).mean()
     weekly_data = []
     for i, day in enumerate(days):
         a_val = weekly_a.get(i, 0) if not pd.isna(weekly_a.get(i, 0)) else 0
@@ -617,10 +729,6 @@ def main():
         print("Error: No data could be loaded!")
         return
     
-    # Sort and Clean
-    df = df[df.index.notna()]
-    df = df.sort_index()
-    
     print(f"Date range: {df.index.min()} to {df.index.max()}")
     
     # Get power columns
@@ -650,8 +758,8 @@ def main():
         'max_power': power_a.max(),
         'min_power': power_a[power_a > 0].min() if (power_a > 0).any() else 0,
         'std_power': power_a.std(),
-        'weekday_avg': power_a[power_a.index.dayofweek < 5].mean(),
-        'weekend_avg': power_a[power_a.index.dayofweek >= 5].mean(),
+        'weekday_avg': power_a[get_time_keys(power_a)['dow'] < 5].mean(),
+        'weekend_avg': power_a[get_time_keys(power_a)['dow'] >= 5].mean(),
         'data_coverage': 100 * power_a.notna().mean(),
         'load_factor': calculate_load_factor(power_a.dropna()),
         'peak_to_avg': calculate_peak_to_average_ratio(power_a.dropna()),
@@ -663,8 +771,8 @@ def main():
         'max_power': power_b.max(),
         'min_power': power_b[power_b > 0].min() if (power_b > 0).any() else 0,
         'std_power': power_b.std(),
-        'weekday_avg': power_b[power_b.index.dayofweek < 5].mean(),
-        'weekend_avg': power_b[power_b.index.dayofweek >= 5].mean(),
+        'weekday_avg': power_b[get_time_keys(power_b)['dow'] < 5].mean(),
+        'weekend_avg': power_b[get_time_keys(power_b)['dow'] >= 5].mean(),
         'data_coverage': 100 * power_b.notna().mean(),
         'load_factor': calculate_load_factor(power_b.dropna()),
         'peak_to_avg': calculate_peak_to_average_ratio(power_b.dropna()),
@@ -686,22 +794,29 @@ def main():
     # Generate visualizations
     print("\n[4/5] Generating visualizations...")
     
-    plot_monthly_comparison(power_a.dropna(), power_b.dropna(),
-                           save_path=os.path.join(output_dir, "v2_01_monthly_comparison.png"))
-    
-    plot_heatmap_comparison(power_a.dropna(), power_b.dropna(),
-                           save_path=os.path.join(output_dir, "v2_02_heatmap_comparison.png"))
+    valid_a = power_a.dropna()
+    valid_b = power_b.dropna()
     
-    plot_efficiency_metrics(metrics_a, metrics_b,
-                           save_path=os.path.join(output_dir, "v2_03_efficiency_metrics.png"))
-    
-    plot_peak_analysis(power_a.dropna(), power_b.dropna(),
-                      save_path=os.path.join(output_dir, "v2_04_peak_analysis.png"))
+    plot_jobs = [
+        (plot_monthly_comparison, (valid_a, valid_b), "v2_01_monthly_comparison.png"),
+        (plot_heatmap_comparison, (valid_a, valid_b), "v2_02_heatmap_comparison.png"),
+        (plot_efficiency_metrics, (metrics_a, metrics_b), "v2_03_efficiency_metrics.png"),
+        (plot_peak_analysis, (valid_a, valid_b), "v2_04_peak_analysis.png"),
+    ]
+    # The plots are independent; render them in separate processes since
+    # pyplot's global figure state is not safe to share between threads
+    with ProcessPoolExecutor() as executor:
+        futures = [
+            executor.submit(plot_func, *args, save_path=os.path.join(output_dir, file_name))
+            for plot_func, args, file_name in plot_jobs
+        ]
+        for future in futures:
+            future.result()
     
     # Export data for React dashboard
     print("\n[5/5] Exporting dashboard data...")
     dashboard_data = export_dashboard_data(
-        power_a.dropna(), power_b.dropna(), 
+        valid_a, valid_b, 
         metrics_a, metrics_b,
         os.path.join(output_dir, "dashboard_data.json")
     )